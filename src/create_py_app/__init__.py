@@ -0,0 +1,10 @@
+# Imported lazily so that loading the CLI doesn't pull in the scaffolder
+LIBRARY_NAMES = {"scaffold_many", "ProjectSpec", "ScaffoldResult"}
+
+
+def __getattr__(name: str):
+    if name in LIBRARY_NAMES:
+        import create_py_app.batch
+
+        return getattr(create_py_app.batch, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
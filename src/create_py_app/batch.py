@@ -0,0 +1,166 @@
+import argparse
+import threading
+import time
+import tomllib
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass, fields
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from create_py_app import templates
+from create_py_app.scaffold import KindOfThing, Scaffolder, ScaffoldOptions
+
+# Options that are pre-selected in the interactive picker are on by default
+SPEC_DEFAULTS = {"vs_code": True, "set_up_git": True, "record_manifest": True}
+
+
+@dataclass
+class ProjectSpec:
+    project_name: str
+    project_folder: Path
+    options: ScaffoldOptions
+
+
+def option_names() -> list[str]:
+    return [f.name for f in fields(ScaffoldOptions) if f.name != "kind"]
+
+
+def options_from_spec(spec: dict) -> ScaffoldOptions:
+    known = set(option_names()) | {"kind", "name", "folder"}
+    unknown = set(spec) - known
+    if unknown:
+        raise ValueError(f"Unknown project settings: {', '.join(sorted(unknown))}")
+    kind_name = str(spec.get("kind", "program")).upper()
+    if kind_name not in KindOfThing.__members__:
+        raise ValueError(f"Unknown kind {spec.get('kind')!r}")
+    values = {}
+    for name in option_names():
+        value = spec.get(name, SPEC_DEFAULTS.get(name, False))
+        if not isinstance(value, bool):
+            raise ValueError(f"{name} must be true or false, not {value!r}")
+        values[name] = value
+    return ScaffoldOptions(kind=KindOfThing[kind_name], **values)
+
+
+def read_manifest(manifest_path: Path) -> list[ProjectSpec]:
+    with open(manifest_path, "rb") as f:
+        manifest = tomllib.load(f)
+    defaults = manifest.get("defaults", {})
+    base_folder = manifest_path.parent
+    specs: list[ProjectSpec] = []
+    for project in manifest.get("projects", []):
+        merged = defaults | project
+        if "name" not in merged:
+            raise ValueError("Every project in the manifest needs a name")
+        name = merged["name"]
+        specs.append(
+            ProjectSpec(
+                project_name=name,
+                project_folder=base_folder / merged.get("folder", name),
+                options=options_from_spec(merged),
+            )
+        )
+    return specs
+
+
+def is_nonempty_folder(folder: Path) -> bool:
+    return folder.exists() and folder.is_dir() and any(folder.iterdir())
+
+
+def scaffold_spec(spec: ProjectSpec) -> str:
+    if not spec.project_folder.exists():
+        spec.project_folder.mkdir(parents=True)
+    Scaffolder(spec.project_name, spec.project_folder, spec.options).write()
+    return spec.project_name
+
+
+@dataclass
+class ScaffoldResult:
+    spec: ProjectSpec
+    error: str | None
+    seconds: float
+
+
+def warm_templates() -> None:
+    """Compile every template up front, once per worker process."""
+    for name in templates.environment.list_templates(
+        filter_func=lambda name: name.endswith("_template.txt")
+    ):
+        templates.get_template(name)
+
+
+def timed_scaffold(spec: ProjectSpec) -> ScaffoldResult:
+    start = time.perf_counter()
+    try:
+        scaffold_spec(spec)
+        error = None
+    except Exception as e:
+        error = str(e)
+    return ScaffoldResult(spec, error, time.perf_counter() - start)
+
+
+def scaffold_many(
+    specs: Iterable[ProjectSpec],
+    workers: int = 1,
+    cancel: threading.Event | None = None,
+) -> Iterator[ScaffoldResult]:
+    """Scaffold every spec, yielding each result as soon as it finishes. With
+    more than one worker the projects are spread over a process pool. Setting
+    cancel, or closing the iterator, stops projects that haven't started."""
+    if workers <= 1:
+        for spec in specs:
+            if cancel is not None and cancel.is_set():
+                return
+            yield timed_scaffold(spec)
+        return
+    executor = ProcessPoolExecutor(max_workers=workers, initializer=warm_templates)
+    try:
+        futures = {executor.submit(timed_scaffold, spec): spec for spec in specs}
+        pending = set(futures)
+        while pending:
+            if cancel is not None and cancel.is_set():
+                return
+            done, pending = wait(pending, timeout=0.1, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    yield future.result()
+                except Exception as e:
+                    yield ScaffoldResult(futures[future], str(e), 0.0)
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def batch_main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(prog="create_py_app batch")
+    parser.add_argument("manifest", help="TOML file listing the projects to create")
+    parser.add_argument("--overwrite", help="Overwrite", action="store_true")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of processes to scaffold with",
+    )
+    args = parser.parse_args(argv)
+    try:
+        specs = read_manifest(Path(args.manifest))
+    except (OSError, ValueError, tomllib.TOMLDecodeError) as e:
+        print(f"Could not read manifest {args.manifest}: {e}")
+        return 1
+    if not args.overwrite:
+        nonempty = [
+            s.project_folder for s in specs if is_nonempty_folder(s.project_folder)
+        ]
+        if nonempty:
+            for folder in nonempty:
+                print(f"Folder {folder} is not empty. Refusing to do anything")
+            return 1
+    failed = 0
+    for result in scaffold_many(specs, args.workers):
+        name = result.spec.project_name
+        if result.error is None:
+            print(f"Wrote {name} in {result.seconds:.2f}s")
+        else:
+            failed += 1
+            print(f"Failed to write {name}: {result.error}")
+    print(f"Wrote {len(specs) - failed} of {len(specs)} projects")
+    return 1 if failed else 0
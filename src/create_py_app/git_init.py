@@ -0,0 +1,85 @@
+import os
+import subprocess
+import threading
+from pathlib import Path
+
+DEFAULT_BRANCH = "main"
+
+
+def write_git_skeleton(project_folder: Path) -> None:
+    """Create the minimal layout git needs to recognise an empty repository,
+    without spawning git."""
+    git_folder = project_folder / ".git"
+    for folder in ("objects/info", "objects/pack", "refs/heads", "refs/tags"):
+        (git_folder / folder).mkdir(parents=True, exist_ok=True)
+    (git_folder / "HEAD").write_text(f"ref: refs/heads/{DEFAULT_BRANCH}\n")
+    filemode = "false" if os.name == "nt" else "true"
+    (git_folder / "config").write_text(
+        "[core]\n"
+        "\trepositoryformatversion = 0\n"
+        f"\tfilemode = {filemode}\n"
+        "\tbare = false\n"
+        "\tlogallrefupdates = true\n"
+    )
+
+
+def run_git(args: list[str], cwd: Path) -> bool:
+    try:
+        result = subprocess.run(
+            ["git", *args], cwd=cwd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE
+        )
+    except FileNotFoundError:
+        print("Could not find git. Skipping git setup")
+        return False
+    if result.returncode != 0:
+        print(f"git {args[0]} failed: {result.stderr.decode(errors='replace')}")
+        return False
+    return True
+
+
+class GitInitializer:
+    """Initializes a repository on a background thread so the spawn of git
+    overlaps with rendering and writing the project files."""
+
+    def __init__(self, project_folder: Path, in_process: bool = False) -> None:
+        self.project_folder = project_folder
+        self.in_process = in_process
+        self.thread: threading.Thread | None = None
+        self.initialized = False
+        # False when the folder was already a repository before this run
+        self.created = False
+
+    def start(self) -> None:
+        if (self.project_folder / ".git").exists():
+            self.initialized = True
+            return
+        self.created = True
+        self.thread = threading.Thread(target=self._init, daemon=True)
+        self.thread.start()
+
+    def _init(self) -> None:
+        self.project_folder.mkdir(parents=True, exist_ok=True)
+        if self.in_process:
+            write_git_skeleton(self.project_folder)
+            self.initialized = True
+        else:
+            self.initialized = run_git(["init", "-q"], self.project_folder)
+
+    def join(self) -> bool:
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+        return self.initialized
+
+    def commit(self, message: str = "Initial commit") -> bool:
+        """Stage everything with a single git add and commit it. A repository
+        that existed before this run is left for the user to commit, since it
+        may hold their own pending work."""
+        if not self.join():
+            return False
+        if not self.created:
+            print("Not committing to the existing repository")
+            return False
+        return run_git(["add", "-A"], self.project_folder) and run_git(
+            ["commit", "-q", "-m", message], self.project_folder
+        )
@@ -1,12 +1,16 @@
-from create_py_app.pick.picker import MultiOptionsPicker, SingleItemPicker
+# The pickers pull in curses, so they are only imported once a picker runs
 
 
 def pick_multi(options: list[tuple[str, bool]], title: str):
+    from create_py_app.pick.picker import MultiOptionsPicker
+
     picker = MultiOptionsPicker(options, title)
     return picker.start()
 
 
 def pick_single(options: list[str], title: str) -> str:
+    from create_py_app.pick.picker import SingleItemPicker
+
     picker = SingleItemPicker(options, title)
     val = picker.start()
     assert val is not None
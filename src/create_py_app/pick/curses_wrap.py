@@ -19,12 +19,38 @@ class Screen(Protocol):
     def refresh(self):
         ...
 
+    def noutrefresh(self):
+        ...
+
+    def move(self, y: int, x: int):
+        ...
+
+    def clrtoeol(self):
+        ...
+
     def getch(self) -> int:
         ...
 
 
 def run_and_return_result(st: Callable[[Screen], list[str] | None]) -> list[str] | None:
-    return curses.wrapper(st)  # type: ignore
+    from create_py_app.pick.headless import headless_screen
+
+    screen = headless_screen()
+    if screen is not None:
+        return st(screen)
+
+    def run_in_curses(screen: Screen):
+        config_curses()
+        return st(screen)
+
+    return curses.wrapper(run_in_curses)  # type: ignore
+
+
+def doupdate(screen: Screen) -> None:
+    # A curses window only queues its changes on noutrefresh, so push them to
+    # the terminal in one go
+    if isinstance(screen, curses.window):
+        curses.doupdate()
 
 
 def config_curses():
@@ -0,0 +1,133 @@
+import os
+import re
+import shutil
+import sys
+from abc import ABC, abstractmethod
+from typing import Iterable, Iterator, TextIO
+
+import create_py_app.pick.keycodes as kc
+
+KEYS_ENV_VAR = "CREATE_PY_APP_KEYS"
+
+KEY_NAMES = {
+    "enter": ord("\n"),
+    "esc": kc.ESC,
+    "space": ord(" "),
+    "up": kc.KEY_UP,
+    "down": kc.KEY_DOWN,
+    "right": kc.KEY_RIGHT,
+    "pgup": kc.KEY_PPAGE,
+    "pgdn": kc.KEY_NPAGE,
+    "home": kc.KEY_HOME,
+    "end": kc.KEY_END,
+    "bs": kc.KEY_BACKSPACE,
+    "lt": ord("<"),
+}
+KEY_TOKEN = re.compile(r"<(\w+)>|(.)", re.DOTALL)
+
+
+def parse_keys(script: str) -> list[int]:
+    """Turn a key script such as "jj<space><enter>" into key codes. Plain
+    characters stand for themselves and <name> stands for a special key."""
+    keys: list[int] = []
+    for match in KEY_TOKEN.finditer(script):
+        name, char = match.groups()
+        if name is None:
+            keys.append(ord(char))
+        elif name.lower() in KEY_NAMES:
+            keys.append(KEY_NAMES[name.lower()])
+        else:
+            raise ValueError(f"Unknown key <{name}>")
+    return keys
+
+
+class BufferScreen(ABC):
+    """A Screen that keeps the drawn rows in memory instead of a terminal.
+    Subclasses decide where keys come from."""
+
+    def __init__(self, size: tuple[int, int] = (24, 80)) -> None:
+        self.size = size
+        self.rows: dict[int, str] = {}
+        self.cursor_y = 0
+
+    def getmaxyx(self) -> tuple[int, int]:
+        return self.size
+
+    def clear(self):
+        self.rows = {}
+
+    def addnstr(self, y: int, x: int, s: str, n: int):
+        self.rows[y] = s[:n]
+
+    def refresh(self):
+        pass
+
+    def noutrefresh(self):
+        pass
+
+    def move(self, y: int, x: int):
+        self.cursor_y = y
+
+    def clrtoeol(self):
+        self.rows.pop(self.cursor_y, None)
+
+    def text(self) -> str:
+        return "\n".join(self.rows[y] for y in sorted(self.rows))
+
+    @abstractmethod
+    def getch(self) -> int:
+        pass
+
+
+class ScriptScreen(BufferScreen):
+    """Replays a fixed key sequence. Once the keys run out it presses ESC, so a
+    picker given a short script quits instead of waiting forever."""
+
+    def __init__(self, keys: Iterable[int], size: tuple[int, int] = (24, 80)) -> None:
+        super().__init__(size)
+        self.keys = iter(keys)
+
+    def getch(self) -> int:
+        return next(self.keys, kc.ESC)
+
+
+class LineScreen(BufferScreen):
+    """Prints each frame to an output stream and reads keys a line at a time
+    from an input stream. A line holds a key script (see parse_keys); an empty
+    line presses ENTER and end of input presses ESC."""
+
+    def __init__(self, stdin: TextIO, stdout: TextIO) -> None:
+        columns, lines = shutil.get_terminal_size()
+        super().__init__((lines, columns))
+        self.stdin = stdin
+        self.stdout = stdout
+        self.pending: list[int] = []
+
+    def getch(self) -> int:
+        while not self.pending:
+            self.stdout.write(self.text() + "\n> ")
+            self.stdout.flush()
+            line = self.stdin.readline()
+            if not line:
+                return kc.ESC
+            line = line.rstrip("\r\n")
+            self.pending = parse_keys(line) if line else [ord("\n")]
+        return self.pending.pop(0)
+
+
+_scripted_keys: tuple[str, Iterator[int]] | None = None
+
+
+def headless_screen() -> BufferScreen | None:
+    """Pick a non-curses backend when there's no terminal to drive, or None to
+    use curses. A key script in CREATE_PY_APP_KEYS is shared by every picker
+    in the process, so one script can answer several prompts."""
+    global _scripted_keys
+    script = os.environ.get(KEYS_ENV_VAR)
+    if script is not None:
+        if _scripted_keys is None or _scripted_keys[0] != script:
+            _scripted_keys = (script, iter(parse_keys(script)))
+        return ScriptScreen(_scripted_keys[1])
+    if not sys.stdin.isatty():
+        return LineScreen(sys.stdin, sys.stdout)
+    return None
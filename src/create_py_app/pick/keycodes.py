@@ -7,3 +7,8 @@ KEY_UP = curses.KEY_UP  # type: ignore
 KEY_DOWN = curses.KEY_DOWN  # type: ignore
 ESC = curses.ascii.ESC  # type: ignore
 KEY_RIGHT = curses.KEY_RIGHT  # type: ignore
+KEY_PPAGE = curses.KEY_PPAGE  # type: ignore
+KEY_NPAGE = curses.KEY_NPAGE  # type: ignore
+KEY_HOME = curses.KEY_HOME  # type: ignore
+KEY_END = curses.KEY_END  # type: ignore
+KEY_BACKSPACE = curses.KEY_BACKSPACE  # type: ignore
@@ -3,7 +3,7 @@
 from abc import ABC, abstractmethod
 from create_py_app.pick.curses_wrap import (
     Screen,
-    config_curses,
+    doupdate,
     run_and_return_result,
 )
 
@@ -19,89 +19,227 @@ VS_CODE_KEY_DOWN = 456
 KEYS_ENTER = (kc.KEY_ENTER, ord("\n"), ord("\r"))
 KEYS_UP = (kc.KEY_UP, ord("k"), VS_CODE_KEY_UP)
 KEYS_DOWN = (kc.KEY_DOWN, ord("j"), VS_CODE_KEY_DOWN)
+KEYS_PAGE_UP = (kc.KEY_PPAGE,)
+KEYS_PAGE_DOWN = (kc.KEY_NPAGE,)
+KEYS_HOME = (kc.KEY_HOME, ord("g"))
+KEYS_END = (kc.KEY_END, ord("G"))
 QUIT_KEYS = (kc.ESC, ord("q"))
 KEYS_SELECT = (kc.KEY_RIGHT, ord(" "))
+KEYS_FILTER = (ord("/"),)
+KEYS_BACKSPACE = (kc.KEY_BACKSPACE, 127, 8)
+FILTER_PROMPT = "Filter: "
+
+
+def fuzzy_match(query: str, text: str) -> bool:
+    """True if the characters of query appear in text in order."""
+    remaining = iter(text)
+    return all(char in remaining for char in query)
 
 
 class Picker(ABC):
-    options: list[str]
-    title: str
+    # When set, only rows whose text changed since the last frame are redrawn
+    incremental_redraw = True
+    page_size = 1
+    _title_lines: list[str] | None = None
+    _option_lines: dict[int, str] | None = None
+    _drawn_lines: list[str] | None = None
+    _drawn_size: tuple[int, int] | None = None
+
+    def __init__(self, options: list[str], title: str) -> None:
+        # index is the highlighted option, position is where it sits among the
+        # options that pass the filter
+        self.index = 0
+        self.position = 0
+        self.title = title
+        self.options = options
+        self.visible: range | list[int] = range(len(options))
+        self.filtering = False
+        self.query = ""
+        # One (query, matches) entry per typed character, so growing the query
+        # only rescans the previous matches and backspace is a pop
+        self._filter_stack: list[tuple[str, list[int]]] = []
+        self._lowered_options: list[str] | None = None
 
     @abstractmethod
-    def get_option_lines(self) -> list[str]:
+    def format_option(self, index: int) -> str:
         pass
 
     @abstractmethod
     def run_loop(self, screen: Screen) -> list[str] | None:
         pass
 
+    def navigate(self, c: int) -> bool:
+        """Move the cursor for navigation keys. Returns False if c isn't one."""
+        if c in KEYS_UP:
+            self.move_up()
+        elif c in KEYS_DOWN:
+            self.move_down()
+        elif c in KEYS_PAGE_UP:
+            self.move_to(max(self.position - self.page_size, 0))
+        elif c in KEYS_PAGE_DOWN:
+            self.move_to(min(self.position + self.page_size, len(self.visible) - 1))
+        elif c in KEYS_HOME:
+            self.move_to(0)
+        elif c in KEYS_END:
+            self.move_to(len(self.visible) - 1)
+        else:
+            return False
+        return True
+
     def move_up(self) -> None:
-        self.index -= 1
-        if self.index < 0:
-            self.index = len(self.options) - 1
+        position = self.position - 1
+        if position < 0:
+            position = len(self.visible) - 1
+        self.move_to(position)
 
     def move_down(self) -> None:
-        self.index += 1
-        if self.index >= len(self.options):
-            self.index = 0
+        position = self.position + 1
+        if position >= len(self.visible):
+            position = 0
+        self.move_to(position)
+
+    def move_to(self, position: int) -> None:
+        if not self.visible:
+            return
+        previous = self.index
+        self.position = position
+        self.index = self.visible[position]
+        self.refresh_options(previous, self.index)
+
+    def handle_filter_key(self, c: int) -> bool:
+        """Handle "/" and the keys typed while filtering. Returns False for
+        keys the picker should handle itself."""
+        if not self.filtering:
+            if c in KEYS_FILTER:
+                self.filtering = True
+                return True
+            return False
+        if c in KEYS_ENTER:
+            # Stop typing but keep the filter applied
+            self.filtering = False
+        elif c == kc.ESC:
+            self.filtering = False
+            self.set_filter("")
+        elif c in KEYS_BACKSPACE:
+            self.set_filter(self.query[:-1])
+        elif 32 <= c < 127:
+            self.set_filter(self.query + chr(c))
+        else:
+            return False
+        return True
+
+    def set_filter(self, query: str) -> None:
+        query = query.lower()
+        if self._lowered_options is None:
+            self._lowered_options = [option.lower() for option in self.options]
+        while self._filter_stack and not query.startswith(self._filter_stack[-1][0]):
+            self._filter_stack.pop()
+        if query and (not self._filter_stack or self._filter_stack[-1][0] != query):
+            pool = (
+                self._filter_stack[-1][1]
+                if self._filter_stack
+                else range(len(self.options))
+            )
+            matches = [i for i in pool if fuzzy_match(query, self._lowered_options[i])]
+            self._filter_stack.append((query, matches))
+        self.query = query
+        self.visible = self._filter_stack[-1][1] if query else range(len(self.options))
+        # Keep the cursor on the same option when it still matches
+        if self.index in self.visible:
+            self.move_to(self.visible.index(self.index))
+        else:
+            self.move_to(0)
+
+    def refresh_options(self, *indexes: int) -> None:
+        if self._option_lines is None:
+            return
+        for index in indexes:
+            self._option_lines.pop(index, None)
 
     def draw(self, screen: Screen):
-        screen.clear()
         x, y = 1, 1
         max_y, max_x = screen.getmaxyx()
         max_rows = max_y - y
-        lines, current_line = self.get_lines()
-        scroll_top = 0
-        if current_line > max_rows:
-            scroll_top = current_line - max_rows
+        lines_to_draw = self.get_visible_lines(max_rows)
 
-        lines_to_draw = lines[scroll_top : scroll_top + max_rows]
+        previous = self._drawn_lines
+        if (
+            not self.incremental_redraw
+            or previous is None
+            or self._drawn_size != (max_y, max_x)
+        ):
+            screen.clear()
+            previous = []
 
-        for line in lines_to_draw:
-            screen.addnstr(y, x, line, max_x - 2)
-            y += 1
+        for row, line in enumerate(lines_to_draw):
+            if row < len(previous) and previous[row] == line:
+                continue
+            if row < len(previous):
+                screen.move(y + row, 0)
+                screen.clrtoeol()
+            screen.addnstr(y + row, x, line, max_x - 2)
+        for row in range(len(lines_to_draw), len(previous)):
+            screen.move(y + row, 0)
+            screen.clrtoeol()
 
-        screen.refresh()
+        self._drawn_lines = lines_to_draw
+        self._drawn_size = (max_y, max_x)
+        screen.noutrefresh()
+        doupdate(screen)
 
     def get_title_lines(self) -> list[str]:
-        if self.title:
-            return self.title.split("\n") + [""]
-        return []
+        if self._title_lines is None:
+            self._title_lines = self.title.split("\n") + [""] if self.title else []
+        return self._title_lines
 
-    def get_lines(self) -> tuple[list[str], int]:
-        title_lines = self.get_title_lines()
-        option_lines = self.get_option_lines()
-        lines = title_lines + option_lines
-        current_line = self.index + len(title_lines) + 1
-        return lines, current_line
+    def get_header_lines(self) -> list[str]:
+        if self.filtering or self.query:
+            return self.get_title_lines() + [f"{FILTER_PROMPT}{self.query}"]
+        return self.get_title_lines()
 
-    def start(self) -> list[str] | None:
-        return run_and_return_result(self._start)
+    def get_option_line(self, index: int) -> str:
+        if self._option_lines is None:
+            self._option_lines = {}
+        line = self._option_lines.get(index)
+        if line is None:
+            line = self._option_lines[index] = self.format_option(index)
+        return line
 
-    def _start(self, screen: Screen):
-        config_curses()
-        return self.run_loop(screen)
+    def get_visible_lines(self, max_rows: int) -> list[str]:
+        """Lines that fit in max_rows with the cursor in view. Only the options
+        inside the viewport are formatted."""
+        header_lines = self.get_header_lines()
+        self.page_size = max(max_rows - len(header_lines), 1)
+        current_line = self.position + len(header_lines) + 1
+        scroll_top = max(current_line - max_rows, 0)
+        scroll_bottom = scroll_top + max_rows
+        lines = header_lines[scroll_top:scroll_bottom]
+        first_option = max(scroll_top - len(header_lines), 0)
+        last_option = min(scroll_bottom - len(header_lines), len(self.visible))
+        lines += [
+            self.get_option_line(i) for i in self.visible[first_option:last_option]
+        ]
+        return lines
+
+    def start(self) -> list[str] | None:
+        return run_and_return_result(self.run_loop)
 
 
 class MultiOptionsPicker(Picker):
     def __init__(self, options: list[tuple[str, bool]], title: str) -> None:
-        self.index = 0
-        self.selected_indexes: list[int] = []
-        self.title = title
-        self.options = [o[0] for o in options]
-        self.selected_indexes = []
+        super().__init__([o[0] for o in options], title)
+        # A dict keeps insertion order, so it doubles as an ordered set
+        self.selected_indexes: dict[int, None] = {}
         for i, opt in enumerate(options):
             if opt[1]:
-                self.selected_indexes.append(i)
+                self.selected_indexes[i] = None
 
     def run_loop(self, screen: Screen) -> list[str] | None:
         while True:
             self.draw(screen)
             c = screen.getch()
-            if c in KEYS_UP:
-                self.move_up()
-            elif c in KEYS_DOWN:
-                self.move_down()
+            if self.handle_filter_key(c) or self.navigate(c):
+                continue
             elif c in KEYS_ENTER:
                 if len(self.selected_indexes) < 1:
                     continue
@@ -109,58 +247,47 @@ class MultiOptionsPicker(Picker):
             elif c in QUIT_KEYS:
                 return None
             elif c in KEYS_SELECT:
-                self.mark_index()
+                if self.visible:
+                    self.mark_index()
 
     def mark_index(self) -> None:
         if self.index in self.selected_indexes:
-            self.selected_indexes.remove(self.index)
+            del self.selected_indexes[self.index]
         else:
-            self.selected_indexes.append(self.index)
-
-    def get_option_lines(self) -> list[str]:
-        lines: list[str] = []
-        for index, option in enumerate(self.options):
-            if index == self.index:
-                prefix = INDICATOR
-            else:
-                prefix = len(INDICATOR) * " "
-
-            symbol = (
-                SYMBOL_FILLED_CIRCLE
-                if index in self.selected_indexes
-                else SYMBOL_EMPTY_CIRCLE
-            )
-            prefix = f"{prefix} {symbol}"
-            lines.append(f"{prefix} {option}")
+            self.selected_indexes[self.index] = None
+        self.refresh_options(self.index)
 
-        return lines
+    def format_option(self, index: int) -> str:
+        if index == self.index:
+            prefix = INDICATOR
+        else:
+            prefix = len(INDICATOR) * " "
 
+        symbol = (
+            SYMBOL_FILLED_CIRCLE
+            if index in self.selected_indexes
+            else SYMBOL_EMPTY_CIRCLE
+        )
+        prefix = f"{prefix} {symbol}"
+        return f"{prefix} {self.options[index]}"
 
-class SingleItemPicker(Picker):
-    def __init__(self, options: list[str], title: str) -> None:
-        self.index = 0
-        self.title = title
-        self.options = options
 
+class SingleItemPicker(Picker):
     def run_loop(self, screen: Screen) -> list[str] | None:
         while True:
             self.draw(screen)
             c = screen.getch()
-            if c in KEYS_UP:
-                self.move_up()
-            elif c in KEYS_DOWN:
-                self.move_down()
+            if self.handle_filter_key(c) or self.navigate(c):
+                continue
             elif c in QUIT_KEYS:
                 return None
             elif c in KEYS_SELECT + KEYS_ENTER:
-                return [self.options[self.index]]
-
-    def get_option_lines(self) -> list[str]:
-        lines: list[str] = []
-        for index, option in enumerate(self.options):
-            if index == self.index:
-                prefix = "==>"
-            else:
-                prefix = len("==>") * " "
-            lines.append(f"{prefix} {option}")
-        return lines
+                if self.visible:
+                    return [self.options[self.index]]
+
+    def format_option(self, index: int) -> str:
+        if index == self.index:
+            prefix = "==>"
+        else:
+            prefix = len("==>") * " "
+        return f"{prefix} {self.options[index]}"
@@ -0,0 +1,118 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import BinaryIO
+
+DEFAULT_WRITE_WORKERS = 8
+
+
+@dataclass
+class ScaffoldPlan:
+    """Everything a scaffold would put on disk, built up in memory."""
+
+    root: Path
+    files: dict[Path, bytes] = field(default_factory=dict)
+    directories: set[Path] = field(default_factory=set)
+    # Files written only when they don't exist yet, like a package __init__.py
+    # that the user may already have filled in
+    create_if_missing: set[Path] = field(default_factory=set)
+
+    def add_directory(self, path: Path) -> None:
+        self.directories.add(path)
+
+    def add_file(
+        self, path: Path, content: str | bytes = b"", create_if_missing: bool = False
+    ) -> None:
+        if isinstance(content, str):
+            content = content.encode("utf-8")
+        self.files[path] = content
+        if create_if_missing:
+            self.create_if_missing.add(path)
+        else:
+            self.create_if_missing.discard(path)
+
+    def relative_files(self) -> list[str]:
+        return sorted(path.relative_to(self.root).as_posix() for path in self.files)
+
+
+def write_plan(
+    plan: ScaffoldPlan,
+    workers: int = DEFAULT_WRITE_WORKERS,
+    write_times: dict[Path, float] | None = None,
+) -> None:
+    """Create every directory once, then write the files through a thread
+    pool. If write_times is given, it is filled with seconds spent per file."""
+    for directory in plan.directories:
+        directory.mkdir(parents=True, exist_ok=True)
+
+    def write_one(item: tuple[Path, bytes]) -> None:
+        path, content = item
+        start = time.perf_counter()
+        if path in plan.create_if_missing:
+            try:
+                # "x" fails if the file exists, so there is no gap between
+                # checking and writing
+                with path.open("xb") as f:
+                    f.write(content)
+            except FileExistsError:
+                return
+        else:
+            path.write_bytes(content)
+        if write_times is not None:
+            write_times[path] = time.perf_counter() - start
+
+    if workers <= 1:
+        for item in plan.files.items():
+            write_one(item)
+        return
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        # Consume the iterator so exceptions from the workers are raised here
+        list(executor.map(write_one, plan.files.items()))
+
+
+def archive_format(filename: str) -> str:
+    if filename.endswith(".zip"):
+        return "zip"
+    if filename.endswith((".tar.gz", ".tgz")):
+        return "tar.gz"
+    return "tar"
+
+
+def write_archive(plan: ScaffoldPlan, stream: BinaryIO, fmt: str = "tar") -> None:
+    """Write the plan as a single tar, tar.gz or zip stream. Entries are
+    placed under a top-level folder named after the plan root."""
+    import io
+    import tarfile
+    import zipfile
+
+    top = Path(plan.root.resolve().name)
+    directories = sorted(top / d.relative_to(plan.root) for d in plan.directories)
+    files = sorted(
+        (top / path.relative_to(plan.root), content)
+        for path, content in plan.files.items()
+    )
+    if fmt == "zip":
+        with zipfile.ZipFile(stream, "w", zipfile.ZIP_DEFLATED) as archive:
+            for directory in directories:
+                archive.writestr(directory.as_posix() + "/", b"")
+            for name, content in files:
+                archive.writestr(name.as_posix(), content)
+        return
+    if fmt not in ("tar", "tar.gz"):
+        raise ValueError(f"Unknown archive format {fmt}")
+    mode = "w|gz" if fmt == "tar.gz" else "w|"
+    mtime = int(time.time())
+    with tarfile.open(fileobj=stream, mode=mode) as archive:
+        for directory in directories:
+            info = tarfile.TarInfo(directory.as_posix())
+            info.type = tarfile.DIRTYPE
+            info.mode = 0o755
+            info.mtime = mtime
+            archive.addfile(info)
+        for name, content in files:
+            info = tarfile.TarInfo(name.as_posix())
+            info.size = len(content)
+            info.mode = 0o644
+            info.mtime = mtime
+            archive.addfile(info, io.BytesIO(content))
@@ -0,0 +1,592 @@
+from enum import Enum
+from dataclasses import dataclass, fields
+import hashlib
+import json
+from pathlib import Path
+import time
+
+from create_py_app.git_init import GitInitializer
+from create_py_app.plan import ScaffoldPlan, write_plan
+from create_py_app.templates import get_template, render
+
+
+class KindOfThing(Enum):
+    PROGRAM = 0
+    PACKAGE = 1
+
+
+KINDS_OF_THING = {
+    "Program (something you run)": KindOfThing.PROGRAM,
+    "Package (something you pip install)": KindOfThing.PACKAGE,
+}
+
+PROGRAM_OPTIONS = [
+    ("Main script", False),
+    ("FastAPI entry point", False),
+    ("Scheduled job", False),
+    ("Logging", False),
+    ("ENV settings", False),
+    ("Set up Sqlalchemy ORM", False),
+    ("Use an async Sqlalchemy engine", False),
+    ("Paginate and stream API list endpoints", False),
+    ("Serialize API responses with orjson", False),
+    ("Production server launcher", False),
+    ("Request timing and profiling middleware", False),
+    ("In-process metrics", False),
+    ("Response and query caching", False),
+    ("Set up repository design pattern", False),
+    ("Set up a file for configuring dependency injection", False),
+    ("Add TkInter UI", False),
+]
+
+COMMON_OPTIONS = [
+    ("Set up VS Code", True),
+    ("Set up Git", True),
+    ("Make an initial git commit", False),
+    ("Track generated files for create_py_app update", True),
+    ("Command line arguments", False),
+]
+
+# Written into generated projects so `create_py_app update` can tell template
+# changes apart from user edits
+MANIFEST_NAME = ".create_py_app.json"
+
+
+@dataclass
+class ScaffoldOptions:
+    kind: KindOfThing
+    write_main_script: bool
+    fast_api: bool
+    parse_args: bool
+    scheduled_job: bool
+    use_logging: bool
+    env_settings: bool
+    vs_code: bool
+    sqla: bool
+    repo_pattern: bool
+    di_setup: bool
+    set_up_git: bool
+    tkinter: bool
+    initial_commit: bool = False
+    git_in_process: bool = False
+    record_manifest: bool = False
+    async_sqla: bool = False
+    paginate: bool = False
+    fast_json: bool = False
+    production_server: bool = False
+    request_timing: bool = False
+    metrics: bool = False
+    caching: bool = False
+
+
+def parse_options(kind: KindOfThing, selected: list[str]) -> ScaffoldOptions:
+    return ScaffoldOptions(
+        kind=kind,
+        write_main_script="Main script" in selected,
+        fast_api="FastAPI entry point" in selected,
+        parse_args="Command line arguments" in selected,
+        scheduled_job="Scheduled job" in selected,
+        use_logging="Logging" in selected,
+        env_settings="ENV settings" in selected,
+        vs_code="Set up VS Code" in selected,
+        sqla="Set up Sqlalchemy ORM" in selected,
+        repo_pattern="Set up repository design pattern" in selected,
+        di_setup="Set up a file for configuring dependency injection" in selected,
+        set_up_git="Set up Git" in selected,
+        tkinter="Add TkInter UI" in selected,
+        initial_commit="Make an initial git commit" in selected,
+        record_manifest="Track generated files for create_py_app update" in selected,
+        async_sqla="Use an async Sqlalchemy engine" in selected,
+        paginate="Paginate and stream API list endpoints" in selected,
+        fast_json="Serialize API responses with orjson" in selected,
+        production_server="Production server launcher" in selected,
+        request_timing="Request timing and profiling middleware" in selected,
+        metrics="In-process metrics" in selected,
+        caching="Response and query caching" in selected,
+    )
+
+
+def options_to_spec(options: ScaffoldOptions) -> dict:
+    spec: dict = {"kind": options.kind.name.lower()}
+    for f in fields(ScaffoldOptions):
+        if f.name != "kind":
+            spec[f.name] = getattr(options, f.name)
+    return spec
+
+
+class Scaffolder:
+    def __init__(
+        self,
+        project_name: str,
+        project_folder: Path,
+        options: ScaffoldOptions,
+    ) -> None:
+        self.kind_of_thing = options.kind
+        self.project_name = project_name
+        self.project_folder = project_folder
+        self.options = options
+        self.src_folder = self.project_folder / "src"
+        if self.kind_of_thing == KindOfThing.PACKAGE:
+            self.src_folder = self.src_folder / project_name
+        self.test_folder = self.project_folder / "test"
+        self.plan = ScaffoldPlan(project_folder)
+        # Seconds spent rendering each template, summed over the scaffold
+        self.render_times: dict[str, float] = {}
+
+    @property
+    def use_async_sqla(self) -> bool:
+        return self.options.sqla and self.options.async_sqla
+
+    @property
+    def use_pagination(self) -> bool:
+        return self.options.sqla and self.options.fast_api and self.options.paginate
+
+    @property
+    def use_production_server(self) -> bool:
+        return self.options.fast_api and self.options.production_server
+
+    @property
+    def use_request_timing(self) -> bool:
+        return self.options.fast_api and self.options.request_timing
+
+    def render(self, template_name: str, context: dict | None = None) -> str:
+        start = time.perf_counter()
+        text = render(template_name, context)
+        elapsed = time.perf_counter() - start
+        self.render_times[template_name] = (
+            self.render_times.get(template_name, 0.0) + elapsed
+        )
+        return text
+
+    def write(self):
+        print(f"Writing output to folder {self.project_folder.resolve()}")
+        git = self.maybe_initialize_git() if self.options.set_up_git else None
+        write_plan(self.build_plan())
+        if git is not None:
+            if self.options.initial_commit:
+                git.commit()
+            else:
+                git.join()
+
+    def build_plan(self) -> ScaffoldPlan:
+        """Render every file in memory without touching the filesystem."""
+        self.plan = ScaffoldPlan(self.project_folder)
+        if self.options.set_up_git:
+            self.write_gitignore()
+        self.create_folders()
+        self.plan.add_file(self.src_folder / "__init__.py", create_if_missing=True)
+        if self.kind_of_thing == KindOfThing.PROGRAM:
+            self.create_requirements()
+        self.create_coverage()
+        self.set_up_testing()
+        self.make_readme()
+        if self.options.kind == KindOfThing.PACKAGE:
+            self.write_pyproject_toml()
+            self.write_main_script(self.src_folder / "command.py")
+        if self.options.vs_code:
+            self.write_vs_code_settings()
+        if self.options.env_settings:
+            self.set_up_env_settings()
+        if self.options.use_logging:
+            self.set_up_logging()
+        if self.options.metrics:
+            self.set_up_metrics()
+        if self.options.caching:
+            self.set_up_caching()
+        if self.options.write_main_script:
+            self.write_main_script(self.project_folder / f"{self.project_name}.py")
+        if self.options.sqla:
+            self.set_up_sqla()
+        if self.options.repo_pattern:
+            self.set_up_repo_pattern()
+        if self.options.fast_api:
+            self.add_fastapi_entry_point()
+        if self.options.scheduled_job:
+            self.add_scheduled_job_entry_point()
+        if self.options.di_setup:
+            self.add_configure_services()
+        if self.options.tkinter:
+            self.add_tkinter()
+        if self.options.record_manifest:
+            self.write_manifest()
+        return self.plan
+
+    def write_manifest(self):
+        files = {}
+        for path, content in self.plan.files.items():
+            files[path.relative_to(self.project_folder).as_posix()] = {
+                "sha256": hashlib.sha256(content).hexdigest(),
+                "content": content.decode("utf-8"),
+            }
+        manifest = {
+            "project_name": self.project_name,
+            "options": options_to_spec(self.options),
+            "files": dict(sorted(files.items())),
+        }
+        self.plan.add_file(
+            self.project_folder / MANIFEST_NAME, json.dumps(manifest, indent=2) + "\n"
+        )
+
+    def add_tkinter(self):
+        self.plan.add_file(
+            self.src_folder / "user_interface.py",
+            self.render("user_interface_template.txt"),
+        )
+
+    def add_configure_services(self):
+        self.plan.add_file(
+            self.src_folder / "configure_services.py",
+            self.render(
+                "configure_services_template.txt",
+                {
+                    "blank_configure_services": not self.options.sqla
+                    and not self.options.repo_pattern,
+                    "sqla": self.options.sqla,
+                    "async_sqla": self.use_async_sqla,
+                    "env_settings": self.options.env_settings,
+                },
+            ),
+        )
+
+    def add_scheduled_job_entry_point(self):
+        entry_points_folder = self.maybe_make_entry_points_folder()
+        sch_job_folder = entry_points_folder / "scheduled_job"
+        self.plan.add_directory(sch_job_folder)
+        self.plan.add_file(sch_job_folder / "__init__.py", create_if_missing=True)
+        self.plan.add_file(
+            sch_job_folder / "scheduled_job.py",
+            self.render(
+                "scheduled_job_template.txt",
+                {
+                    "env_settings": self.options.env_settings,
+                    "use_logging": self.options.use_logging,
+                    "metrics": self.options.metrics,
+                },
+            ),
+        )
+
+    def maybe_make_entry_points_folder(self):
+        entry_points_folder = self.src_folder / "entry_points"
+        self.plan.add_directory(entry_points_folder)
+        self.plan.add_file(entry_points_folder / "__init__.py", create_if_missing=True)
+        return entry_points_folder
+
+    def add_fastapi_entry_point(self):
+        entry_points_folder = self.maybe_make_entry_points_folder()
+        api_folder = entry_points_folder / "api"
+        self.plan.add_directory(api_folder)
+        self.plan.add_file(api_folder / "__init__.py", create_if_missing=True)
+        self.plan.add_file(
+            api_folder / "app.py",
+            self.render(
+                "api_main_template.txt",
+                {
+                    "fast_json": self.options.fast_json,
+                    "production_server": self.options.production_server,
+                    "request_timing": self.options.request_timing,
+                    "metrics": self.options.metrics,
+                    "env_settings": self.options.env_settings,
+                    "sqla": self.options.sqla,
+                    "async_sqla": self.use_async_sqla,
+                    "di_setup": self.options.di_setup,
+                },
+            ),
+        )
+        if self.options.production_server:
+            self.plan.add_file(
+                api_folder / "server.py",
+                self.render(
+                    "api_server_template.txt",
+                    {"env_settings": self.options.env_settings},
+                ),
+            )
+        if self.options.metrics:
+            self.plan.add_file(
+                api_folder / "metrics_router.py",
+                self.render("metrics_router_template.txt"),
+            )
+        if self.options.request_timing:
+            self.plan.add_file(
+                api_folder / "timing.py",
+                self.render(
+                    "api_timing_template.txt",
+                    {"env_settings": self.options.env_settings},
+                ),
+            )
+        if self.options.fast_json:
+            self.plan.add_file(
+                api_folder / "responses.py", self.render("api_responses_template.txt")
+            )
+        self.plan.add_file(
+            api_folder / "post_router.py",
+            self.render(
+                "api_router_template.txt",
+                {
+                    "sqla": self.options.sqla,
+                    "async_sqla": self.use_async_sqla,
+                    "di_setup": self.options.di_setup,
+                    "paginate": self.use_pagination,
+                    "fast_json": self.options.fast_json,
+                    "caching": self.options.caching,
+                },
+            ),
+        )
+
+    def set_up_repo_pattern(self):
+        self.plan.add_file(
+            self.src_folder / "base_repo.py",
+            self.render("repo_pattern_template.txt", {"caching": self.options.caching}),
+        )
+        if self.options.sqla:
+            self.plan.add_file(
+                self.src_folder / "example_repo.py",
+                self.render(
+                    "example_repo_template.txt", {"caching": self.options.caching}
+                ),
+            )
+
+    def set_up_sqla(self):
+        self.plan.add_file(
+            self.src_folder / "tables.py",
+            self.render("tables_template.txt", {"paginate": self.use_pagination}),
+        )
+
+    def make_readme(self):
+        self.plan.add_file(
+            self.project_folder / "readme.md",
+            self.render(
+                "readme_template.txt",
+                {
+                    "project_name": self.project_name,
+                    "parse_args": self.options.parse_args,
+                    "production_server": self.use_production_server,
+                    "request_timing": self.use_request_timing,
+                    "metrics": self.options.metrics,
+                    "caching": self.options.caching,
+                    "fast_api": self.options.fast_api,
+                    "scheduled_job": self.options.scheduled_job,
+                },
+            ),
+        )
+
+    def set_up_logging(self):
+        self.plan.add_file(
+            self.src_folder / "logging_setup.py",
+            self.render("logging_setup_template.txt"),
+        )
+
+    def set_up_metrics(self):
+        self.plan.add_file(
+            self.src_folder / "metrics.py", self.render("metrics_template.txt")
+        )
+
+    def set_up_caching(self):
+        self.plan.add_file(
+            self.src_folder / "cache.py",
+            self.render(
+                "cache_template.txt", {"env_settings": self.options.env_settings}
+            ),
+        )
+
+    def set_up_env_settings(self):
+        src_folder = self.src_folder
+        self.plan.add_file(
+            src_folder / "project_settings.py",
+            self.render("settings_template.txt", self.env_context()),
+        )
+        self.plan.add_file(
+            self.project_folder / ".env",
+            self.render("env_template.txt", self.env_context()),
+        )
+        self.plan.add_file(
+            self.project_folder / ".env.template",
+            self.render("env_template.txt", self.env_context()),
+        )
+
+    def env_context(self) -> dict:
+        return {
+            "sqla": self.options.sqla,
+            "async_sqla": self.use_async_sqla,
+            "production_server": self.use_production_server,
+            "request_timing": self.use_request_timing,
+            "scheduled_job": self.options.scheduled_job,
+            "use_logging": self.options.use_logging,
+            "metrics": self.options.metrics,
+            "caching": self.options.caching,
+        }
+
+    def set_up_testing(self):
+        test_folder = self.test_folder
+        self.plan.add_file(
+            test_folder / "__init__.py", self.render("test_init_template.txt")
+        )
+        self.plan.add_file(
+            test_folder / "test_example.py", self.render("test_example_template.txt")
+        )
+        if self.options.fast_api:
+            self.plan.add_file(
+                test_folder / "test_api.py",
+                self.render(
+                    "api_test_template.txt",
+                    {
+                        "di_setup": self.options.di_setup,
+                        "async_sqla": self.use_async_sqla,
+                        "paginate": self.use_pagination,
+                        "request_timing": self.options.request_timing,
+                    },
+                ),
+            )
+        if self.options.fast_api and self.options.sqla and self.options.fast_json:
+            self.plan.add_file(
+                test_folder / "test_serialization_benchmark.py",
+                self.render("serialization_benchmark_test_template.txt"),
+            )
+        if self.use_production_server:
+            self.plan.add_file(
+                test_folder / "test_server.py",
+                self.render("api_server_test_template.txt"),
+            )
+        if self.options.use_logging:
+            self.plan.add_file(
+                test_folder / "test_logging_setup.py",
+                self.render("logging_setup_test_template.txt"),
+            )
+        if self.options.scheduled_job:
+            self.plan.add_file(
+                test_folder / "test_scheduled_job.py",
+                self.render(
+                    "scheduled_job_test_template.txt",
+                    {
+                        "env_settings": self.options.env_settings,
+                        "metrics": self.options.metrics,
+                    },
+                ),
+            )
+        if self.options.metrics:
+            self.plan.add_file(
+                test_folder / "test_metrics.py",
+                self.render(
+                    "metrics_test_template.txt", {"fast_api": self.options.fast_api}
+                ),
+            )
+        if self.options.caching:
+            self.plan.add_file(
+                test_folder / "test_cache.py",
+                self.render(
+                    "cache_test_template.txt",
+                    {"repo": self.options.sqla and self.options.repo_pattern},
+                ),
+            )
+        if self.options.sqla:
+            self.plan.add_file(
+                test_folder / "conftest.py",
+                self.render("conftest_template.txt", {"caching": self.options.caching}),
+            )
+        if self.options.sqla and self.options.repo_pattern:
+            self.plan.add_file(
+                test_folder / "test_example_repo.py",
+                self.render("repo_test_template.txt"),
+            )
+            self.plan.add_file(
+                test_folder / "test_insert_benchmark.py",
+                self.render("insert_benchmark_test_template.txt"),
+            )
+        if self.options.sqla and self.options.di_setup and self.options.env_settings:
+            self.plan.add_file(
+                test_folder / "test_pool.py", self.render("pool_test_template.txt")
+            )
+
+    def create_coverage(self):
+        self.plan.add_file(
+            self.project_folder / ".coveragerc",
+            self.render(
+                "coverage_rc_template.txt", {"env_settings": self.options.env_settings}
+            ),
+        )
+
+    def create_requirements(self):
+        self.plan.add_file(
+            self.project_folder / "requirements.in",
+            self.render(
+                "requirements_in_template.txt",
+                {
+                    "env_settings": self.options.env_settings,
+                    "sqla": self.options.sqla or self.options.repo_pattern,
+                    "async_sqla": self.use_async_sqla,
+                    "fast_api": self.options.fast_api,
+                    "fast_json": self.options.fast_api and self.options.fast_json,
+                    "scheduled_job": self.options.scheduled_job,
+                },
+            ),
+        )
+        self.plan.add_file(
+            self.project_folder / "requirements-dev.in",
+            self.render("requirements_in_dev_template.txt"),
+        )
+
+    def create_folders(self):
+        self.plan.add_directory(self.project_folder)
+        self.plan.add_directory(self.src_folder)
+        self.plan.add_directory(self.test_folder)
+
+    def write_gitignore(self):
+        self.plan.add_file(
+            self.project_folder / ".gitignore",
+            self.render(
+                "gitignore_template.txt",
+                {
+                    "fast_api": self.options.fast_api,
+                    "request_timing": self.use_request_timing,
+                    "scheduled_job": self.options.scheduled_job,
+                    "metrics": self.options.metrics,
+                },
+            ),
+        )
+
+    def maybe_initialize_git(self) -> GitInitializer:
+        """Start git init in the background; the caller joins it later."""
+        git = GitInitializer(self.project_folder, self.options.git_in_process)
+        git.start()
+        return git
+
+    def write_vs_code_settings(self):
+        vs_code_folder = self.project_folder / ".vscode"
+        self.plan.add_directory(vs_code_folder)
+        if self.kind_of_thing == KindOfThing.PACKAGE:
+            entrypoint = f"src/{self.project_name}/command.py"
+        else:
+            entrypoint = f"{self.project_name}.py"
+        self.plan.add_file(
+            vs_code_folder / "launch.json",
+            self.render(
+                "vs_code_launch_json_template.txt",
+                {
+                    "entrypoint": entrypoint,
+                    "fast_api": self.options.fast_api,
+                    "scheduled_job": self.options.scheduled_job,
+                    "has_args": self.options.parse_args,
+                },
+            ),
+        )
+        self.plan.add_file(
+            vs_code_folder / "settings.json",
+            self.render("vs_code_settings_template.txt"),
+        )
+
+    def write_main_script(self, target: Path):
+        context = {
+            "use_logging": self.options.use_logging,
+            "env_settings": self.options.env_settings,
+            "parse_args": self.options.parse_args,
+            "tkinter": self.options.tkinter,
+        }
+        if not self.options.parse_args:
+            context["empty_main"] = True
+        self.plan.add_file(target, self.render("main_template.txt", context))
+
+    def write_pyproject_toml(self):
+        context = {"appname": self.project_name}
+        self.plan.add_file(
+            self.project_folder / f"pyproject.toml",
+            self.render("pyproject_toml_template.txt", context),
+        )
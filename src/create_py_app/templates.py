@@ -0,0 +1,179 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import NamedTuple
+
+import jinja2
+
+TEMPLATE_CACHE_ENV_VAR = "CREATE_PY_APP_TEMPLATE_CACHE"
+RENDER_CACHE_ENV_VAR = "CREATE_PY_APP_RENDER_CACHE"
+TEMPLATE_LRU_SIZE = 64
+RENDER_LRU_SIZE = 256
+
+
+def package_version() -> str:
+    from importlib import metadata
+
+    try:
+        return metadata.version("create_py_app")
+    except metadata.PackageNotFoundError:
+        return "dev"
+
+
+def make_bytecode_cache(
+    cache_dir: str | Path | None,
+) -> jinja2.FileSystemBytecodeCache | None:
+    if not cache_dir:
+        return None
+    cache_dir = Path(cache_dir)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    # Key the cache files on the package version so an upgrade never picks up
+    # bytecode compiled from an older set of templates
+    pattern = f"__create_py_app_{package_version()}_%s.cache"
+    return jinja2.FileSystemBytecodeCache(str(cache_dir), pattern)
+
+
+def make_environment(cache_dir: str | Path | None = None) -> jinja2.Environment:
+    return jinja2.Environment(
+        loader=jinja2.PackageLoader("create_py_app", ""),
+        bytecode_cache=make_bytecode_cache(cache_dir),
+        cache_size=TEMPLATE_LRU_SIZE,
+        # Templates ship inside the package, so they can't change under us
+        auto_reload=False,
+    )
+
+
+environment = make_environment(os.environ.get(TEMPLATE_CACHE_ENV_VAR))
+
+
+def configure_template_cache(cache_dir: str | Path | None) -> None:
+    """Swap the shared environment for one using an on-disk bytecode cache
+    in cache_dir (or no on-disk cache when cache_dir is None)."""
+    global environment
+    environment = make_environment(cache_dir)
+
+
+def get_template(template_name: str) -> jinja2.Template:
+    return environment.get_template(template_name)
+
+
+class RenderCacheStats(NamedTuple):
+    hits: int
+    misses: int
+    disk_hits: int
+    currsize: int
+    maxsize: int
+
+
+class RenderCache:
+    """Rendered template output keyed on a hash of the template source and the
+    context. Recently used entries are kept in memory; with a directory set,
+    every entry is also stored on disk so later processes can reuse it."""
+
+    def __init__(
+        self, maxsize: int = RENDER_LRU_SIZE, directory: str | Path | None = None
+    ) -> None:
+        self.maxsize = maxsize
+        self.directory = Path(directory) if directory else None
+        if self.directory is not None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+        self.entries: OrderedDict[str, str] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self.lock = threading.Lock()
+
+    def get(self, key: str) -> str | None:
+        with self.lock:
+            text = self.entries.get(key)
+            if text is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return text
+        if self.directory is not None:
+            try:
+                text = (self.directory / f"{key}.txt").read_text(encoding="utf-8")
+            except OSError:
+                text = None
+            if text is not None:
+                self._remember(key, text)
+                with self.lock:
+                    self.hits += 1
+                    self.disk_hits += 1
+                return text
+        with self.lock:
+            self.misses += 1
+        return None
+
+    def put(self, key: str, text: str) -> None:
+        self._remember(key, text)
+        if self.directory is not None:
+            # Write to a temporary name first so a parallel reader never sees
+            # a partial file
+            target = self.directory / f"{key}.txt"
+            temporary = target.with_suffix(f".{os.getpid()}.tmp")
+            temporary.write_text(text, encoding="utf-8")
+            os.replace(temporary, target)
+
+    def _remember(self, key: str, text: str) -> None:
+        with self.lock:
+            self.entries[key] = text
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+
+    def stats(self) -> RenderCacheStats:
+        with self.lock:
+            return RenderCacheStats(
+                self.hits, self.misses, self.disk_hits, len(self.entries), self.maxsize
+            )
+
+    def clear(self) -> None:
+        with self.lock:
+            self.entries.clear()
+            self.hits = self.misses = self.disk_hits = 0
+
+
+render_cache = RenderCache(directory=os.environ.get(RENDER_CACHE_ENV_VAR))
+_template_hashes: dict[str, str] = {}
+
+
+def configure_render_cache(
+    maxsize: int = RENDER_LRU_SIZE, directory: str | Path | None = None
+) -> None:
+    """Replace the shared render cache, e.g. to persist it in directory."""
+    global render_cache
+    render_cache = RenderCache(maxsize, directory)
+
+
+def render_cache_stats() -> RenderCacheStats:
+    return render_cache.stats()
+
+
+def template_hash(template_name: str) -> str:
+    digest = _template_hashes.get(template_name)
+    if digest is None:
+        assert environment.loader is not None
+        source, _, _ = environment.loader.get_source(environment, template_name)
+        digest = hashlib.sha256(source.encode("utf-8")).hexdigest()
+        _template_hashes[template_name] = digest
+    return digest
+
+
+def render_key(template_name: str, context: dict) -> str:
+    normalized = json.dumps(context, sort_keys=True, default=str)
+    key_source = f"{template_hash(template_name)}\0{normalized}"
+    return hashlib.sha256(key_source.encode("utf-8")).hexdigest()
+
+
+def render(template_name: str, context: dict | None = None) -> str:
+    context = context or {}
+    key = render_key(template_name, context)
+    text = render_cache.get(key)
+    if text is None:
+        text = get_template(template_name).render(context)
+        render_cache.put(key, text)
+    return text
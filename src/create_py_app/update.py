@@ -0,0 +1,164 @@
+import argparse
+import difflib
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from create_py_app.batch import options_from_spec
+from create_py_app.plan import ScaffoldPlan, write_plan
+from create_py_app.scaffold import MANIFEST_NAME, Scaffolder
+
+CONFLICT_START = "<<<<<<< current\n"
+CONFLICT_MIDDLE = "=======\n"
+CONFLICT_END = ">>>>>>> create_py_app\n"
+
+
+@dataclass
+class UpdateReport:
+    unchanged: list[str] = field(default_factory=list)
+    created: list[str] = field(default_factory=list)
+    updated: list[str] = field(default_factory=list)
+    merged: list[str] = field(default_factory=list)
+    conflicts: list[str] = field(default_factory=list)
+    kept: list[str] = field(default_factory=list)
+    dropped: list[str] = field(default_factory=list)
+
+
+def matched_lines(a: list[str], b: list[str]) -> dict[int, int]:
+    matcher = difflib.SequenceMatcher(None, a, b, autojunk=False)
+    matches: dict[int, int] = {}
+    for block in matcher.get_matching_blocks():
+        for offset in range(block.size):
+            matches[block.a + offset] = block.b + offset
+    return matches
+
+
+def ensure_newline(lines: list[str]) -> list[str]:
+    if lines and not lines[-1].endswith("\n"):
+        return lines[:-1] + [lines[-1] + "\n"]
+    return lines
+
+
+def merge3(base: str, current: str, generated: str) -> tuple[str, bool]:
+    """Line-based three-way merge of the user's file and the newly generated
+    one against the previously generated base. Returns the merged text and
+    whether it contains conflict markers."""
+    b = base.splitlines(keepends=True)
+    c = current.splitlines(keepends=True)
+    g = generated.splitlines(keepends=True)
+    to_current = matched_lines(b, c)
+    to_generated = matched_lines(b, g)
+    merged: list[str] = []
+    conflict = False
+    i = j = k = 0
+    while True:
+        # Base lines kept by both sides anchor the merge; the chunks between
+        # anchors are what each side changed
+        anchor = next(
+            (x for x in range(i, len(b)) if x in to_current and x in to_generated),
+            None,
+        )
+        if anchor is None:
+            end_b, end_c, end_g = len(b), len(c), len(g)
+        else:
+            end_b, end_c, end_g = anchor, to_current[anchor], to_generated[anchor]
+        base_chunk, current_chunk, generated_chunk = b[i:end_b], c[j:end_c], g[k:end_g]
+        if current_chunk == base_chunk:
+            merged += generated_chunk
+        elif generated_chunk in (base_chunk, current_chunk):
+            merged += current_chunk
+        else:
+            conflict = True
+            merged += [CONFLICT_START, *ensure_newline(current_chunk), CONFLICT_MIDDLE]
+            merged += [*ensure_newline(generated_chunk), CONFLICT_END]
+        if anchor is None:
+            return "".join(merged), conflict
+        merged.append(b[anchor])
+        i, j, k = anchor + 1, to_current[anchor] + 1, to_generated[anchor] + 1
+
+
+def read_project_manifest(project_folder: Path) -> dict:
+    return json.loads((project_folder / MANIFEST_NAME).read_text(encoding="utf-8"))
+
+
+def update_project(project_folder: Path, dry_run: bool = False) -> UpdateReport:
+    """Re-render a generated project and write only the files that changed.
+    Files the user edited are three-way merged with the new output."""
+    manifest = read_project_manifest(project_folder)
+    options = options_from_spec(manifest["options"])
+    scaffolder = Scaffolder(manifest["project_name"], project_folder, options)
+    plan = scaffolder.build_plan()
+    previous = manifest["files"]
+    report = UpdateReport()
+    to_write = ScaffoldPlan(project_folder)
+    manifest_path = project_folder / MANIFEST_NAME
+    for path, content in plan.files.items():
+        name = path.relative_to(project_folder).as_posix()
+        base = previous.get(name, {}).get("content")
+        base_bytes = base.encode("utf-8") if base is not None else None
+        current = path.read_bytes() if path.exists() else None
+        if current == content:
+            if path != manifest_path:
+                report.unchanged.append(name)
+            continue
+        if path == manifest_path:
+            to_write.add_file(path, content)
+            continue
+        if current is None:
+            if base is None:
+                report.created.append(name)
+                to_write.add_file(path, content)
+            else:
+                # The user deleted a generated file; leave it deleted
+                report.kept.append(name)
+        elif current == base_bytes:
+            report.updated.append(name)
+            to_write.add_file(path, content)
+        elif content == base_bytes:
+            report.kept.append(name)
+        else:
+            text, conflict = merge3(
+                base or "", current.decode("utf-8"), content.decode("utf-8")
+            )
+            (report.conflicts if conflict else report.merged).append(name)
+            to_write.add_file(path, text)
+    generated_names = {p.relative_to(project_folder).as_posix() for p in plan.files}
+    report.dropped = sorted(set(previous) - generated_names)
+    if not dry_run:
+        for path in to_write.files:
+            to_write.add_directory(path.parent)
+        write_plan(to_write)
+    return report
+
+
+def update_main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(prog="create_py_app update")
+    parser.add_argument(
+        "project_folder",
+        nargs="?",
+        default=".",
+        help="Project created by create_py_app (defaults to the current folder)",
+    )
+    parser.add_argument(
+        "--dry-run",
+        help="Report what would change without writing anything",
+        action="store_true",
+    )
+    args = parser.parse_args(argv)
+    project_folder = Path(args.project_folder)
+    if not (project_folder / MANIFEST_NAME).exists():
+        print(f"No {MANIFEST_NAME} in {project_folder}. Was it made by create_py_app?")
+        return 1
+    report = update_project(project_folder, args.dry_run)
+    for label, names in [
+        ("Created", report.created),
+        ("Updated", report.updated),
+        ("Merged", report.merged),
+        ("Conflicts", report.conflicts),
+        ("Kept your version of", report.kept),
+        ("No longer generated", report.dropped),
+    ]:
+        for name in names:
+            print(f"{label}: {name}")
+    print(f"{len(report.unchanged)} files unchanged")
+    return 1 if report.conflicts else 0
@@ -0,0 +1,97 @@
+import threading
+
+import pytest
+
+from create_py_app.batch import options_from_spec, read_manifest, scaffold_many
+from create_py_app.scaffold import KindOfThing
+
+
+def test_options_from_spec_uses_picker_defaults():
+    options = options_from_spec({"name": "foo", "fast_api": True})
+    assert options.kind == KindOfThing.PROGRAM
+    assert options.fast_api
+    assert options.vs_code
+    assert options.set_up_git
+    assert not options.sqla
+
+
+def test_options_from_spec_rejects_unknown_settings():
+    with pytest.raises(ValueError, match="fastapi"):
+        options_from_spec({"name": "foo", "fastapi": True})
+
+
+def test_options_from_spec_rejects_non_bool_settings():
+    with pytest.raises(ValueError, match="sqla must be true or false"):
+        options_from_spec({"name": "foo", "sqla": "false"})
+
+
+def test_read_manifest_merges_defaults(tmp_path):
+    manifest = tmp_path / "manifest.toml"
+    manifest.write_text(
+        """
+[defaults]
+set_up_git = false
+sqla = true
+
+[[projects]]
+name = "svc"
+
+[[projects]]
+name = "lib"
+kind = "package"
+folder = "libs/lib"
+sqla = false
+"""
+    )
+    specs = read_manifest(manifest)
+    assert [s.project_name for s in specs] == ["svc", "lib"]
+    assert specs[0].project_folder == tmp_path / "svc"
+    assert specs[0].options.sqla
+    assert not specs[0].options.set_up_git
+    assert specs[1].project_folder == tmp_path / "libs" / "lib"
+    assert specs[1].options.kind == KindOfThing.PACKAGE
+    assert not specs[1].options.sqla
+
+
+def write_manifest(tmp_path):
+    manifest = tmp_path / "manifest.toml"
+    manifest.write_text(
+        """
+[defaults]
+set_up_git = false
+
+[[projects]]
+name = "one"
+write_main_script = true
+
+[[projects]]
+name = "two"
+"""
+    )
+    return manifest
+
+
+def test_scaffold_many_writes_every_project(tmp_path):
+    results = list(scaffold_many(read_manifest(write_manifest(tmp_path))))
+    assert [r.error for r in results] == [None, None]
+    assert all(r.seconds > 0 for r in results)
+    assert (tmp_path / "one" / "one.py").exists()
+    assert (tmp_path / "two" / "readme.md").exists()
+
+
+def test_scaffold_many_with_process_pool(tmp_path):
+    specs = read_manifest(write_manifest(tmp_path))
+    results = list(scaffold_many(specs, workers=2))
+    assert sorted(r.spec.project_name for r in results) == ["one", "two"]
+    assert [r.error for r in results] == [None, None]
+    assert (tmp_path / "one" / "one.py").exists()
+
+
+def test_scaffold_many_stops_when_cancelled(tmp_path):
+    cancel = threading.Event()
+    results = []
+    for result in scaffold_many(read_manifest(write_manifest(tmp_path)), cancel=cancel):
+        results.append(result)
+        cancel.set()
+    assert len(results) == 1
+    assert not (tmp_path / "two").exists()
@@ -0,0 +1,57 @@
+import shutil
+import subprocess
+
+import pytest
+
+from create_py_app.git_init import GitInitializer
+
+requires_git = pytest.mark.skipif(shutil.which("git") is None, reason="needs git")
+
+
+@pytest.fixture
+def git_identity(monkeypatch):
+    for var in ("GIT_AUTHOR", "GIT_COMMITTER"):
+        monkeypatch.setenv(f"{var}_NAME", "Test")
+        monkeypatch.setenv(f"{var}_EMAIL", "test@example.com")
+
+
+def git_output(folder, *args):
+    return subprocess.run(
+        ["git", *args], cwd=folder, capture_output=True, text=True, check=True
+    ).stdout
+
+
+@requires_git
+def test_in_process_skeleton_is_a_valid_repository(tmp_path):
+    git = GitInitializer(tmp_path, in_process=True)
+    git.start()
+    assert git.join()
+    assert git_output(tmp_path, "rev-parse", "--is-inside-work-tree").strip() == "true"
+
+
+@requires_git
+@pytest.mark.parametrize("in_process", [False, True])
+def test_commit_stages_all_files(tmp_path, git_identity, in_process):
+    git = GitInitializer(tmp_path, in_process=in_process)
+    git.start()
+    (tmp_path / "readme.md").write_text("# foo\n")
+    assert git.commit()
+    assert git_output(tmp_path, "ls-files").split() == ["readme.md"]
+
+
+def test_existing_repository_is_left_alone(tmp_path):
+    (tmp_path / ".git").mkdir()
+    git = GitInitializer(tmp_path, in_process=True)
+    git.start()
+    assert git.join()
+    assert list((tmp_path / ".git").iterdir()) == []
+
+
+@requires_git
+def test_commit_skips_existing_repository(tmp_path, git_identity):
+    subprocess.run(["git", "init", "-q"], cwd=tmp_path, check=True)
+    (tmp_path / "notes.txt").write_text("work in progress\n")
+    git = GitInitializer(tmp_path)
+    git.start()
+    assert not git.commit()
+    assert git_output(tmp_path, "ls-files") == ""
@@ -0,0 +1,41 @@
+import io
+
+import pytest
+
+import create_py_app.pick.keycodes as kc
+from create_py_app.pick import pick_multi, pick_single
+from create_py_app.pick.headless import LineScreen, parse_keys
+from create_py_app.pick.picker import MultiOptionsPicker
+
+
+def test_parse_keys_understands_named_keys():
+    assert parse_keys("j<space><ENTER><lt>") == [
+        ord("j"),
+        ord(" "),
+        ord("\n"),
+        ord("<"),
+    ]
+
+
+def test_parse_keys_rejects_unknown_names():
+    with pytest.raises(ValueError):
+        parse_keys("<nope>")
+
+
+def test_key_script_answers_several_pickers(monkeypatch):
+    monkeypatch.setenv("CREATE_PY_APP_KEYS", "j<enter><space>j<space><enter>")
+    assert pick_single(["program", "package"], "Kind") == "package"
+    assert pick_multi([("a", True), ("b", False)], "Options") == ["b"]
+
+
+def test_line_screen_reads_keys_per_line():
+    stdin = io.StringIO("jj\n \n\n")
+    stdout = io.StringIO()
+    picker = MultiOptionsPicker([("a", False), ("b", False), ("c", False)], "Pick")
+    assert picker.run_loop(LineScreen(stdin, stdout)) == ["c"]
+    assert "* (x) c" in stdout.getvalue()
+
+
+def test_line_screen_quits_at_end_of_input():
+    screen = LineScreen(io.StringIO(""), io.StringIO())
+    assert screen.getch() == kc.ESC
@@ -0,0 +1,210 @@
+import time
+
+import create_py_app.pick.keycodes as kc
+import create_py_app.pick.picker as picker_module
+from create_py_app.pick.headless import ScriptScreen
+from create_py_app.pick.picker import (
+    MultiOptionsPicker,
+    SingleItemPicker,
+    fuzzy_match,
+)
+
+
+class FakeScreen(ScriptScreen):
+    """A ScriptScreen that also counts what the picker paints."""
+
+    def __init__(self, rows: int = 24, cols: int = 80, keys=()) -> None:
+        super().__init__(keys, (rows, cols))
+        self.drawn_rows: list[int] = []
+        self.clears = 0
+
+    def clear(self):
+        self.clears += 1
+        super().clear()
+
+    def addnstr(self, y: int, x: int, s: str, n: int):
+        self.drawn_rows.append(y)
+        super().addnstr(y, x, s, n)
+
+
+class CountingPicker(MultiOptionsPicker):
+    formatted = 0
+
+    def format_option(self, index: int) -> str:
+        self.formatted += 1
+        return super().format_option(index)
+
+
+def many_options(count: int) -> list[tuple[str, bool]]:
+    return [(f"option {i}", i % 7 == 0) for i in range(count)]
+
+
+def test_first_draw_paints_title_and_options():
+    screen = FakeScreen()
+    picker = SingleItemPicker(["one", "two"], "Title")
+    picker.draw(screen)
+    assert screen.rows == {1: "Title", 2: "", 3: "==> one", 4: "    two"}
+    assert screen.clears == 1
+
+
+def test_moving_only_redraws_old_and_new_cursor_rows():
+    screen = FakeScreen()
+    picker = MultiOptionsPicker([("one", False), ("two", True), ("three", False)], "")
+    picker.draw(screen)
+    screen.drawn_rows.clear()
+    picker.move_down()
+    picker.draw(screen)
+    assert sorted(screen.drawn_rows) == [1, 2]
+    assert screen.rows[2] == "* (x) two"
+    assert screen.clears == 1
+
+
+def test_marking_only_redraws_current_row():
+    screen = FakeScreen()
+    picker = MultiOptionsPicker([("one", False), ("two", False)], "")
+    picker.draw(screen)
+    screen.drawn_rows.clear()
+    picker.mark_index()
+    picker.draw(screen)
+    assert screen.drawn_rows == [1]
+    assert screen.rows[1] == "* (x) one"
+
+
+def test_full_redraw_mode_repaints_every_frame():
+    screen = FakeScreen()
+    picker = SingleItemPicker(["one", "two"], "")
+    picker.incremental_redraw = False
+    picker.draw(screen)
+    picker.draw(screen)
+    assert screen.clears == 2
+    assert len(screen.drawn_rows) == 4
+
+
+def test_resize_triggers_full_redraw():
+    screen = FakeScreen()
+    picker = SingleItemPicker(["one", "two"], "")
+    picker.draw(screen)
+    screen.size = (10, 40)
+    picker.draw(screen)
+    assert screen.clears == 2
+
+
+def test_selection_is_returned_in_marking_order():
+    picker = MultiOptionsPicker([("a", False), ("b", False), ("c", False)], "")
+    keys = [kc.KEY_END, ord(" "), kc.KEY_HOME, ord(" "), ord("\n")]
+    assert picker.run_loop(FakeScreen(keys=keys)) == ["c", "a"]
+
+
+def test_page_keys_move_by_visible_options():
+    picker = SingleItemPicker([str(i) for i in range(100)], "Title")
+    screen = FakeScreen(rows=12)
+    picker.draw(screen)
+    # 11 usable rows minus the title and blank line below it
+    assert picker.page_size == 9
+    picker.navigate(kc.KEY_NPAGE)
+    assert picker.index == 9
+    picker.navigate(kc.KEY_END)
+    assert picker.index == 99
+    picker.navigate(kc.KEY_PPAGE)
+    assert picker.index == 90
+    picker.navigate(ord("g"))
+    assert picker.index == 0
+
+
+def test_viewport_scrolls_with_cursor():
+    picker = SingleItemPicker([str(i) for i in range(100)], "")
+    screen = FakeScreen(rows=11)
+    picker.navigate(kc.KEY_END)
+    picker.draw(screen)
+    assert screen.rows[10] == "==> 99"
+    assert screen.rows[1] == "    90"
+
+
+def test_only_visible_options_are_formatted():
+    picker = CountingPicker(many_options(10_000), "Title")
+    picker.draw(FakeScreen(rows=24))
+    assert picker.formatted == 21
+
+
+def test_large_option_list_benchmark():
+    """Two hundred frames over a 10,000 option list. Formatting every option
+    each frame, as the picker used to, blows far past this budget."""
+    picker = CountingPicker(many_options(10_000), "Title")
+    keys = [kc.KEY_NPAGE, ord(" "), ord("j"), ord(" ")] * 50
+    screen = FakeScreen(rows=40, keys=keys + [ord("\n")])
+    start = time.perf_counter()
+    result = picker.run_loop(screen)
+    elapsed = time.perf_counter() - start
+    assert result is not None
+    assert picker.formatted < 40 * len(keys)
+    assert elapsed < 0.5
+
+
+def type_keys(text: str) -> list[int]:
+    return [ord(char) for char in text]
+
+
+def test_filter_narrows_visible_options():
+    picker = SingleItemPicker(["apple", "banana", "apricot", "cherry"], "")
+    screen = FakeScreen()
+    for c in type_keys("/ap"):
+        picker.handle_filter_key(c)
+    picker.draw(screen)
+    assert [picker.options[i] for i in picker.visible] == ["apple", "apricot"]
+    assert screen.rows[1] == "Filter: ap"
+
+
+def test_filter_is_fuzzy_and_case_insensitive():
+    picker = SingleItemPicker(["FastAPI entry point", "Scheduled job"], "")
+    keys = type_keys("/fapi") + [ord("\n"), ord("\n")]
+    assert picker.run_loop(FakeScreen(keys=keys)) == ["FastAPI entry point"]
+
+
+def test_growing_query_only_rescans_previous_matches(monkeypatch):
+    calls = []
+
+    def counting_match(query, text):
+        calls.append(text)
+        return fuzzy_match(query, text)
+
+    monkeypatch.setattr(picker_module, "fuzzy_match", counting_match)
+    picker = SingleItemPicker([f"item {i}" for i in range(1000)], "")
+    picker.set_filter("1")
+    assert len(calls) == 1000
+    previous_matches = len(picker.visible)
+    calls.clear()
+    picker.set_filter("12")
+    assert len(calls) == previous_matches
+    calls.clear()
+    picker.set_filter("1")
+    assert calls == []
+
+
+def test_backspace_restores_previous_matches():
+    picker = SingleItemPicker(["apple", "banana", "apricot"], "")
+    for c in type_keys("/apr") + [kc.KEY_BACKSPACE]:
+        picker.handle_filter_key(c)
+    assert list(picker.visible) == [0, 2]
+    picker.handle_filter_key(kc.ESC)
+    assert list(picker.visible) == [0, 1, 2]
+    assert not picker.filtering
+
+
+def test_selection_survives_filtering():
+    picker = MultiOptionsPicker([("apple", False), ("banana", False)], "")
+    keys = (
+        [ord("j"), ord(" ")]
+        + type_keys("/app")
+        + [ord("\n"), ord(" "), kc.ESC, ord("\n")]
+    )
+    # ESC is pressed after leaving typing mode, so it quits the picker
+    assert picker.run_loop(FakeScreen(keys=keys)) is None
+    assert list(picker.selected_indexes) == [1, 0]
+
+
+def test_cursor_stays_on_option_while_it_matches():
+    picker = SingleItemPicker(["apple", "banana", "apricot"], "")
+    picker.navigate(kc.KEY_END)
+    picker.set_filter("ap")
+    assert picker.index == 2
+    assert picker.position == 1
@@ -0,0 +1,79 @@
+import io
+import tarfile
+import zipfile
+
+from create_py_app.scaffold import KindOfThing, Scaffolder, ScaffoldOptions
+from create_py_app.plan import ScaffoldPlan, write_archive, write_plan
+
+
+def make_plan(root):
+    plan = ScaffoldPlan(root)
+    plan.add_directory(root)
+    plan.add_directory(root / "src")
+    plan.add_file(root / "src" / "__init__.py")
+    plan.add_file(root / "readme.md", "# foo\n")
+    return plan
+
+
+def test_build_plan_does_not_touch_disk(tmp_path):
+    project = tmp_path / "foo"
+    dut = Scaffolder(
+        "foo",
+        project,
+        ScaffoldOptions(
+            kind=KindOfThing.PROGRAM,
+            write_main_script=True,
+            fast_api=True,
+            parse_args=False,
+            scheduled_job=True,
+            use_logging=False,
+            env_settings=False,
+            vs_code=True,
+            sqla=False,
+            repo_pattern=False,
+            di_setup=False,
+            set_up_git=True,
+            tkinter=False,
+        ),
+    )
+    plan = dut.build_plan()
+    assert not project.exists()
+    assert "src/entry_points/api/app.py" in plan.relative_files()
+    assert project / "src" / "entry_points" / "scheduled_job" in plan.directories
+
+
+def test_write_plan_creates_folders_and_files(tmp_path):
+    root = tmp_path / "foo"
+    write_plan(make_plan(root))
+    assert (root / "src" / "__init__.py").read_bytes() == b""
+    assert (root / "readme.md").read_text() == "# foo\n"
+
+
+def test_write_plan_leaves_existing_create_if_missing_files_alone(tmp_path):
+    root = tmp_path / "foo"
+    (root / "src").mkdir(parents=True)
+    (root / "src" / "__init__.py").write_text("VERSION = 1\n")
+    plan = make_plan(root)
+    plan.add_file(root / "src" / "__init__.py", create_if_missing=True)
+    plan.add_file(root / "test_init.py", create_if_missing=True)
+    write_plan(plan)
+    assert (root / "src" / "__init__.py").read_text() == "VERSION = 1\n"
+    assert (root / "test_init.py").read_bytes() == b""
+
+
+def test_write_archive_as_tar(tmp_path):
+    stream = io.BytesIO()
+    write_archive(make_plan(tmp_path / "foo"), stream, "tar")
+    stream.seek(0)
+    with tarfile.open(fileobj=stream) as archive:
+        assert archive.extractfile("foo/readme.md").read() == b"# foo\n"
+        assert archive.getmember("foo/src").isdir()
+
+
+def test_write_archive_as_zip(tmp_path):
+    stream = io.BytesIO()
+    write_archive(make_plan(tmp_path / "foo"), stream, "zip")
+    stream.seek(0)
+    with zipfile.ZipFile(stream) as archive:
+        assert archive.read("foo/readme.md") == b"# foo\n"
+        assert "foo/src/__init__.py" in archive.namelist()
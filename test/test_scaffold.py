@@ -1,4 +1,4 @@
-from unittest.mock import Mock
+from unittest.mock import MagicMock, Mock
 
 import black
 
@@ -44,8 +44,11 @@ class PathMock(Mock):
         self.created_paths[other] = next_path
         return next_path
 
+    def open(self, *args, **kwargs):
+        return MagicMock()
+
     def written_text(self):
-        return self.write_text.call_args[0][0]
+        return self.write_bytes.call_args[0][0].decode("utf-8")
 
 
 def test_creates_main_with_correct_filename():
@@ -125,7 +128,7 @@ def test_writes_main_with_logging_when_selected():
     )
     dut.write()
     main_file = path.created_paths["foo.py"]
-    assert "logging.basicConfig" in main_file.written_text()
+    assert "listener = configure_logging()" in main_file.written_text()
     assert main_file.written_text() == format_using_black(main_file.written_text())
 
 
@@ -340,6 +343,7 @@ def test_writes_repo_patt_when_selected():
     dut.write()
     repo_file = path.created_paths["src"].created_paths["base_repo.py"]
     assert "class BaseRepository(Protocol)" in repo_file.written_text()
+    assert "def bulk_upsert(" in repo_file.written_text()
     assert repo_file.written_text() == format_using_black(repo_file.written_text())
 
 
@@ -509,3 +513,562 @@ def test_writes_sqla_to_configure_services_when_selected():
     cs_file = path.created_paths["src"].created_paths["configure_services.py"]
     assert "def get_sync_session_factory()" in cs_file.written_text()
     # assert cs_file.written_text() == format_using_black(cs_file.written_text())
+
+
+def test_writes_async_sqla_to_configure_services_when_selected():
+    path = PathMock()
+    dut = Scaffolder(
+        "foo",
+        path,
+        ScaffoldOptions(
+            kind=KindOfThing.PROGRAM,
+            write_main_script=False,
+            fast_api=False,
+            parse_args=False,
+            scheduled_job=False,
+            use_logging=False,
+            env_settings=False,
+            vs_code=False,
+            sqla=True,
+            repo_pattern=False,
+            di_setup=True,
+            set_up_git=False,
+            tkinter=False,
+            async_sqla=True,
+        ),
+    )
+    dut.write()
+    cs_file = path.created_paths["src"].created_paths["configure_services.py"]
+    assert "create_async_engine" in cs_file.written_text()
+    assert "async def get_db()" in cs_file.written_text()
+    assert cs_file.written_text() == format_using_black(cs_file.written_text())
+
+
+def test_writes_async_driver_to_requirements_when_async_sqla_selected():
+    path = PathMock()
+    dut = Scaffolder(
+        "foo",
+        path,
+        ScaffoldOptions(
+            kind=KindOfThing.PROGRAM,
+            write_main_script=False,
+            fast_api=False,
+            parse_args=False,
+            scheduled_job=False,
+            use_logging=False,
+            env_settings=False,
+            vs_code=False,
+            sqla=True,
+            repo_pattern=False,
+            di_setup=False,
+            set_up_git=False,
+            tkinter=False,
+            async_sqla=True,
+        ),
+    )
+    dut.write()
+    req_file = path.created_paths["requirements.in"]
+    assert "SQLAlchemy[asyncio]" in req_file.written_text()
+    assert "aiosqlite" in req_file.written_text()
+
+
+def test_writes_awaited_query_to_router_when_async_sqla_selected():
+    path = PathMock()
+    dut = Scaffolder(
+        "foo",
+        path,
+        ScaffoldOptions(
+            kind=KindOfThing.PROGRAM,
+            write_main_script=False,
+            fast_api=True,
+            parse_args=False,
+            scheduled_job=False,
+            use_logging=False,
+            env_settings=False,
+            vs_code=False,
+            sqla=True,
+            repo_pattern=False,
+            di_setup=False,
+            set_up_git=False,
+            tkinter=False,
+            async_sqla=True,
+        ),
+    )
+    dut.write()
+    api_folder = (
+        path.created_paths["src"].created_paths["entry_points"].created_paths["api"]
+    )
+    router_file = api_folder.created_paths["post_router.py"]
+    assert "await db.execute(stmt)" in router_file.written_text()
+    assert router_file.written_text() == format_using_black(router_file.written_text())
+    test_file = path.created_paths["test"].created_paths["test_api.py"]
+    assert "sqlite+aiosqlite://" in test_file.written_text()
+    assert test_file.written_text() == format_using_black(test_file.written_text())
+
+
+def test_ignores_async_sqla_without_sqla():
+    path = PathMock()
+    dut = Scaffolder(
+        "foo",
+        path,
+        ScaffoldOptions(
+            kind=KindOfThing.PROGRAM,
+            write_main_script=False,
+            fast_api=False,
+            parse_args=False,
+            scheduled_job=False,
+            use_logging=False,
+            env_settings=False,
+            vs_code=False,
+            sqla=False,
+            repo_pattern=True,
+            di_setup=False,
+            set_up_git=False,
+            tkinter=False,
+            async_sqla=True,
+        ),
+    )
+    dut.write()
+    req_file = path.created_paths["requirements.in"]
+    assert "aiosqlite" not in req_file.written_text()
+
+
+def test_writes_pool_settings_and_load_test_when_sqla_and_settings_selected():
+    path = PathMock()
+    dut = Scaffolder(
+        "foo",
+        path,
+        ScaffoldOptions(
+            kind=KindOfThing.PROGRAM,
+            write_main_script=False,
+            fast_api=False,
+            parse_args=False,
+            scheduled_job=False,
+            use_logging=False,
+            env_settings=True,
+            vs_code=False,
+            sqla=True,
+            repo_pattern=False,
+            di_setup=True,
+            set_up_git=False,
+            tkinter=False,
+        ),
+    )
+    dut.write()
+    settings_file = path.created_paths["src"].created_paths["project_settings.py"]
+    assert "pool_size: int" in settings_file.written_text()
+    env_file = path.created_paths[".env.template"]
+    assert "POOL_SIZE=" in env_file.written_text()
+    cs_file = path.created_paths["src"].created_paths["configure_services.py"]
+    assert "**engine_options(settings.conn_str)" in cs_file.written_text()
+    assert cs_file.written_text() == format_using_black(cs_file.written_text())
+    pool_test = path.created_paths["test"].created_paths["test_pool.py"]
+    assert pool_test.written_text() == format_using_black(pool_test.written_text())
+
+
+def test_writes_keyset_pagination_when_selected():
+    path = PathMock()
+    dut = Scaffolder(
+        "foo",
+        path,
+        ScaffoldOptions(
+            kind=KindOfThing.PROGRAM,
+            write_main_script=False,
+            fast_api=True,
+            parse_args=False,
+            scheduled_job=False,
+            use_logging=False,
+            env_settings=False,
+            vs_code=False,
+            sqla=True,
+            repo_pattern=False,
+            di_setup=True,
+            set_up_git=False,
+            tkinter=False,
+            paginate=True,
+        ),
+    )
+    dut.write()
+    api_folder = (
+        path.created_paths["src"].created_paths["entry_points"].created_paths["api"]
+    )
+    router_file = api_folder.created_paths["post_router.py"]
+    assert "def decode_cursor(" in router_file.written_text()
+    assert "yield_per=EXPORT_BATCH_SIZE" in router_file.written_text()
+    assert router_file.written_text() == format_using_black(router_file.written_text())
+    tables_file = path.created_paths["src"].created_paths["tables.py"]
+    assert "ix_posts_created_at_post_id" in tables_file.written_text()
+    test_file = path.created_paths["test"].created_paths["test_api.py"]
+    assert "def test_export_memory_does_not_grow" in test_file.written_text()
+    assert test_file.written_text() == format_using_black(test_file.written_text())
+
+
+def test_writes_indexed_int_foreign_key_to_tables():
+    path = PathMock()
+    dut = Scaffolder(
+        "foo",
+        path,
+        ScaffoldOptions(
+            kind=KindOfThing.PROGRAM,
+            write_main_script=False,
+            fast_api=False,
+            parse_args=False,
+            scheduled_job=False,
+            use_logging=False,
+            env_settings=False,
+            vs_code=False,
+            sqla=True,
+            repo_pattern=False,
+            di_setup=False,
+            set_up_git=False,
+            tkinter=False,
+        ),
+    )
+    dut.write()
+    tables_file = path.created_paths["src"].created_paths["tables.py"]
+    assert (
+        'post_id: Mapped[int] = mapped_column(ForeignKey("posts.post_id"), index=True)'
+        in tables_file.written_text()
+    )
+    conftest_file = path.created_paths["test"].created_paths["conftest.py"]
+    assert "def max_queries()" in conftest_file.written_text()
+    assert conftest_file.written_text() == format_using_black(
+        conftest_file.written_text()
+    )
+
+
+def test_writes_selectinload_repo_methods_when_sqla_also_selected():
+    path = PathMock()
+    dut = Scaffolder(
+        "foo",
+        path,
+        ScaffoldOptions(
+            kind=KindOfThing.PROGRAM,
+            write_main_script=False,
+            fast_api=False,
+            parse_args=False,
+            scheduled_job=False,
+            use_logging=False,
+            env_settings=False,
+            vs_code=False,
+            sqla=True,
+            repo_pattern=True,
+            di_setup=False,
+            set_up_git=False,
+            tkinter=False,
+        ),
+    )
+    dut.write()
+    repo_file = path.created_paths["src"].created_paths["example_repo.py"]
+    assert "selectinload(PostDto.comments)" in repo_file.written_text()
+    repo_test = path.created_paths["test"].created_paths["test_example_repo.py"]
+    assert "with max_queries(2):" in repo_test.written_text()
+    assert repo_test.written_text() == format_using_black(repo_test.written_text())
+    benchmark = path.created_paths["test"].created_paths["test_insert_benchmark.py"]
+    assert benchmark.written_text() == format_using_black(benchmark.written_text())
+
+
+def test_writes_orjson_response_class_when_selected():
+    path = PathMock()
+    dut = Scaffolder(
+        "foo",
+        path,
+        ScaffoldOptions(
+            kind=KindOfThing.PROGRAM,
+            write_main_script=False,
+            fast_api=True,
+            parse_args=False,
+            scheduled_job=False,
+            use_logging=False,
+            env_settings=False,
+            vs_code=False,
+            sqla=True,
+            repo_pattern=False,
+            di_setup=False,
+            set_up_git=False,
+            tkinter=False,
+            fast_json=True,
+        ),
+    )
+    dut.write()
+    api_folder = (
+        path.created_paths["src"].created_paths["entry_points"].created_paths["api"]
+    )
+    app_file = api_folder.created_paths["app.py"]
+    assert "FastAPI(default_response_class=OrjsonResponse)" in app_file.written_text()
+    router_file = api_folder.created_paths["post_router.py"]
+    assert "return OrjsonResponse(" in router_file.written_text()
+    assert router_file.written_text() == format_using_black(router_file.written_text())
+    req_file = path.created_paths["requirements.in"]
+    assert "orjson" in req_file.written_text()
+    benchmark = path.created_paths["test"].created_paths[
+        "test_serialization_benchmark.py"
+    ]
+    assert benchmark.written_text() == format_using_black(benchmark.written_text())
+
+
+def test_writes_production_server_when_selected():
+    path = PathMock()
+    dut = Scaffolder(
+        "foo",
+        path,
+        ScaffoldOptions(
+            kind=KindOfThing.PROGRAM,
+            write_main_script=False,
+            fast_api=True,
+            parse_args=False,
+            scheduled_job=False,
+            use_logging=False,
+            env_settings=True,
+            vs_code=False,
+            sqla=False,
+            repo_pattern=False,
+            di_setup=False,
+            set_up_git=False,
+            tkinter=False,
+            production_server=True,
+        ),
+    )
+    dut.write()
+    api_folder = (
+        path.created_paths["src"].created_paths["entry_points"].created_paths["api"]
+    )
+    server_file = api_folder.created_paths["server.py"]
+    assert "workers=worker_count(settings.web_workers)" in server_file.written_text()
+    assert server_file.written_text() == format_using_black(server_file.written_text())
+    app_file = api_folder.created_paths["app.py"]
+    assert "FastAPI(lifespan=lifespan)" in app_file.written_text()
+    settings_file = path.created_paths["src"].created_paths["project_settings.py"]
+    assert "web_graceful_shutdown_seconds: int" in settings_file.written_text()
+    smoke_test = path.created_paths["test"].created_paths["test_server.py"]
+    assert smoke_test.written_text() == format_using_black(smoke_test.written_text())
+
+
+def test_writes_scheduler_settings_when_scheduled_job_selected():
+    path = PathMock()
+    dut = Scaffolder(
+        "foo",
+        path,
+        ScaffoldOptions(
+            kind=KindOfThing.PROGRAM,
+            write_main_script=False,
+            fast_api=False,
+            parse_args=False,
+            scheduled_job=True,
+            use_logging=False,
+            env_settings=True,
+            vs_code=False,
+            sqla=False,
+            repo_pattern=False,
+            di_setup=False,
+            set_up_git=False,
+            tkinter=False,
+        ),
+    )
+    dut.write()
+    job_folder = (
+        path.created_paths["src"]
+        .created_paths["entry_points"]
+        .created_paths["scheduled_job"]
+    )
+    job_file = job_folder.created_paths["scheduled_job.py"]
+    assert '"max_instances": settings.job_max_instances' in job_file.written_text()
+    assert job_file.written_text() == format_using_black(job_file.written_text())
+    settings_file = path.created_paths["src"].created_paths["project_settings.py"]
+    assert "job_misfire_grace_seconds: int" in settings_file.written_text()
+    job_test = path.created_paths["test"].created_paths["test_scheduled_job.py"]
+    assert job_test.written_text() == format_using_black(job_test.written_text())
+
+
+def test_writes_queued_logging_setup_when_logging_selected():
+    path = PathMock()
+    dut = Scaffolder(
+        "foo",
+        path,
+        ScaffoldOptions(
+            kind=KindOfThing.PROGRAM,
+            write_main_script=True,
+            fast_api=False,
+            parse_args=True,
+            scheduled_job=True,
+            use_logging=True,
+            env_settings=True,
+            vs_code=False,
+            sqla=False,
+            repo_pattern=False,
+            di_setup=False,
+            set_up_git=False,
+            tkinter=False,
+        ),
+    )
+    dut.write()
+    logging_file = path.created_paths["src"].created_paths["logging_setup.py"]
+    assert "QueueListener" in logging_file.written_text()
+    main_file = path.created_paths["foo.py"]
+    assert "listener = configure_logging(" in main_file.written_text()
+    assert main_file.written_text() == format_using_black(main_file.written_text())
+    job_file = (
+        path.created_paths["src"]
+        .created_paths["entry_points"]
+        .created_paths["scheduled_job"]
+        .created_paths["scheduled_job.py"]
+    )
+    assert "from src.project_settings import settings" in job_file.written_text()
+    assert "settings.log_folder" in job_file.written_text()
+    settings_file = path.created_paths["src"].created_paths["project_settings.py"]
+    assert "log_folder: Optional[str] = None" in settings_file.written_text()
+
+
+def test_writes_timing_middleware_when_selected():
+    path = PathMock()
+    dut = Scaffolder(
+        "foo",
+        path,
+        ScaffoldOptions(
+            kind=KindOfThing.PROGRAM,
+            write_main_script=False,
+            fast_api=True,
+            parse_args=False,
+            scheduled_job=False,
+            use_logging=False,
+            env_settings=True,
+            vs_code=False,
+            sqla=True,
+            repo_pattern=False,
+            di_setup=True,
+            set_up_git=True,
+            tkinter=False,
+            request_timing=True,
+        ),
+    )
+    dut.write()
+    api_folder = (
+        path.created_paths["src"].created_paths["entry_points"].created_paths["api"]
+    )
+    timing_file = api_folder.created_paths["timing.py"]
+    assert "class TimingMiddleware" in timing_file.written_text()
+    assert timing_file.written_text() == format_using_black(timing_file.written_text())
+    app_file = api_folder.created_paths["app.py"]
+    assert "profile_token=settings.profile_token" in app_file.written_text()
+    assert app_file.written_text() == format_using_black(app_file.written_text())
+    api_test = path.created_paths["test"].created_paths["test_api.py"]
+    assert "def test_profile_needs_the_token" in api_test.written_text()
+    assert api_test.written_text() == format_using_black(api_test.written_text())
+    gitignore = path.created_paths[".gitignore"]
+    assert gitignore.written_text().endswith("unittest.db\nprofiles/\n")
+
+
+def test_writes_metrics_route_when_selected():
+    path = PathMock()
+    dut = Scaffolder(
+        "foo",
+        path,
+        ScaffoldOptions(
+            kind=KindOfThing.PROGRAM,
+            write_main_script=False,
+            fast_api=True,
+            parse_args=False,
+            scheduled_job=False,
+            use_logging=False,
+            env_settings=False,
+            vs_code=False,
+            sqla=False,
+            repo_pattern=False,
+            di_setup=False,
+            set_up_git=False,
+            tkinter=False,
+            metrics=True,
+        ),
+    )
+    dut.write()
+    metrics_file = path.created_paths["src"].created_paths["metrics.py"]
+    assert "class Histogram(Metric)" in metrics_file.written_text()
+    api_folder = (
+        path.created_paths["src"].created_paths["entry_points"].created_paths["api"]
+    )
+    router_file = api_folder.created_paths["metrics_router.py"]
+    assert '@router.get("/metrics"' in router_file.written_text()
+    app_file = api_folder.created_paths["app.py"]
+    assert "app.include_router(metrics_router.router)" in app_file.written_text()
+    metrics_test = path.created_paths["test"].created_paths["test_metrics.py"]
+    assert "def test_metrics_endpoint_can_be_scraped" in metrics_test.written_text()
+    assert metrics_test.written_text() == format_using_black(
+        metrics_test.written_text()
+    )
+
+
+def test_writes_job_metrics_when_scheduled_job_also_selected():
+    path = PathMock()
+    dut = Scaffolder(
+        "foo",
+        path,
+        ScaffoldOptions(
+            kind=KindOfThing.PROGRAM,
+            write_main_script=False,
+            fast_api=False,
+            parse_args=False,
+            scheduled_job=True,
+            use_logging=False,
+            env_settings=True,
+            vs_code=False,
+            sqla=False,
+            repo_pattern=False,
+            di_setup=False,
+            set_up_git=False,
+            tkinter=False,
+            metrics=True,
+        ),
+    )
+    dut.write()
+    job_file = (
+        path.created_paths["src"]
+        .created_paths["entry_points"]
+        .created_paths["scheduled_job"]
+        .created_paths["scheduled_job.py"]
+    )
+    assert "JOB_RUN_SECONDS.labels(event.job_id)" in job_file.written_text()
+    assert "settings.metrics_file" in job_file.written_text()
+    assert job_file.written_text() == format_using_black(job_file.written_text())
+
+
+def test_writes_cache_and_hooks_it_into_repositories_when_selected():
+    path = PathMock()
+    dut = Scaffolder(
+        "foo",
+        path,
+        ScaffoldOptions(
+            kind=KindOfThing.PROGRAM,
+            write_main_script=False,
+            fast_api=True,
+            parse_args=False,
+            scheduled_job=False,
+            use_logging=False,
+            env_settings=False,
+            vs_code=False,
+            sqla=True,
+            repo_pattern=True,
+            di_setup=True,
+            set_up_git=False,
+            tkinter=False,
+            caching=True,
+        ),
+    )
+    dut.write()
+    src_folder = path.created_paths["src"]
+    cache_file = src_folder.created_paths["cache.py"]
+    assert "def cached(" in cache_file.written_text()
+    assert cache_file.written_text() == format_using_black(cache_file.written_text())
+    base_repo = src_folder.created_paths["base_repo.py"]
+    assert "cache.invalidate(*self.cache_tags)" in base_repo.written_text()
+    example_repo = src_folder.created_paths["example_repo.py"]
+    assert "cache_tags = (POSTS_TAG,)" in example_repo.written_text()
+    router_file = (
+        src_folder.created_paths["entry_points"]
+        .created_paths["api"]
+        .created_paths["post_router.py"]
+    )
+    assert "@cached(tags=[POSTS_TAG], key_params=[])" in router_file.written_text()
+    test_folder = path.created_paths["test"]
+    assert "cache.clear()" in test_folder.created_paths["conftest.py"].written_text()
+    cache_test = test_folder.created_paths["test_cache.py"]
+    assert "def test_commit_invalidates_cached_queries" in cache_test.written_text()
@@ -0,0 +1,181 @@
+"""Timing benchmarks for Scaffolder across option combinations.
+
+By default a pairwise-reduced set of combinations is used (every pair of
+option values appears in at least one project). Set CREATE_PY_APP_BENCH_ALL=1
+to run every combination. Timings are compared against benchmark_baseline.json;
+set CREATE_PY_APP_UPDATE_BASELINE=1 to rewrite it and commit the result.
+"""
+import itertools
+import json
+import os
+import statistics
+import tempfile
+import time
+from dataclasses import fields
+from pathlib import Path
+
+import pytest
+
+from create_py_app import templates
+from create_py_app.plan import write_plan
+from create_py_app.scaffold import KindOfThing, Scaffolder, ScaffoldOptions
+
+BASELINE_PATH = Path(__file__).parent / "benchmark_baseline.json"
+# A measurement only fails when it is both this many times the baseline and
+# more than the floor above it, so machine noise doesn't trip the check
+TOLERANCE_FACTOR = 5.0
+TOLERANCE_FLOOR_MS = 2.0
+# Git setup spawns processes and isn't part of rendering or writing
+EXCLUDED_OPTIONS = {"set_up_git", "initial_commit", "git_in_process"}
+TMPFS = Path("/dev/shm")
+
+
+def option_factors() -> dict[str, list]:
+    factors: dict[str, list] = {"kind": list(KindOfThing)}
+    for f in fields(ScaffoldOptions):
+        if f.name != "kind" and f.name not in EXCLUDED_OPTIONS:
+            factors[f.name] = [False, True]
+    return factors
+
+
+def pairwise_combinations(factors: dict[str, list]) -> list[dict]:
+    """Greedily build rows until every pair of values of every two factors
+    shows up in at least one row."""
+    names = list(factors)
+
+    def pairs_in(row: dict) -> set:
+        return {
+            (a, row[a], b, row[b])
+            for a, b in itertools.combinations(names, 2)
+            if a in row and b in row
+        }
+
+    uncovered = {
+        (a, va, b, vb)
+        for a, b in itertools.combinations(names, 2)
+        for va in factors[a]
+        for vb in factors[b]
+    }
+    rows: list[dict] = []
+    while uncovered:
+        a, va, b, vb = min(uncovered, key=repr)
+        row = {a: va, b: vb}
+        for name in names:
+            if name not in row:
+                row[name] = max(
+                    factors[name],
+                    key=lambda value: len(pairs_in(row | {name: value}) & uncovered),
+                )
+        rows.append({name: row[name] for name in names})
+        uncovered -= pairs_in(row)
+    return rows
+
+
+def all_combinations(factors: dict[str, list]) -> list[dict]:
+    names = list(factors)
+    return [dict(zip(names, values)) for values in itertools.product(*factors.values())]
+
+
+def combinations_to_run() -> list[ScaffoldOptions]:
+    factors = option_factors()
+    if os.environ.get("CREATE_PY_APP_BENCH_ALL"):
+        rows = all_combinations(factors)
+    else:
+        rows = pairwise_combinations(factors)
+    return [ScaffoldOptions(**row, set_up_git=False) for row in rows]
+
+
+def run_benchmark(disk_root: Path) -> dict:
+    render_times: dict[str, list[float]] = {}
+    write_times: dict[str, list[float]] = {}
+    memory_times: list[float] = []
+    disk_times: list[float] = []
+    for i, options in enumerate(combinations_to_run()):
+        project_folder = disk_root / f"project_{i}"
+        scaffolder = Scaffolder("bench", project_folder, options)
+        # Measure real template rendering rather than render cache hits
+        templates.render_cache.clear()
+        start = time.perf_counter()
+        plan = scaffolder.build_plan()
+        memory_times.append(time.perf_counter() - start)
+        for name, seconds in scaffolder.render_times.items():
+            render_times.setdefault(name, []).append(seconds)
+
+        file_times: dict[Path, float] = {}
+        start = time.perf_counter()
+        write_plan(plan, write_times=file_times)
+        disk_times.append(time.perf_counter() - start)
+        for path, seconds in file_times.items():
+            name = path.relative_to(project_folder).as_posix()
+            write_times.setdefault(name, []).append(seconds)
+
+    def median_ms(values: list[float]) -> float:
+        return round(statistics.median(values) * 1000, 4)
+
+    return {
+        "scaffold_ms": {
+            "in_memory": median_ms(memory_times),
+            "disk": median_ms(disk_times),
+        },
+        "render_ms": {name: median_ms(v) for name, v in sorted(render_times.items())},
+        "write_ms": {name: median_ms(v) for name, v in sorted(write_times.items())},
+    }
+
+
+def regressions(current: dict, baseline: dict) -> list[str]:
+    found = []
+    for section, values in current.items():
+        for name, ms in values.items():
+            expected = baseline.get(section, {}).get(name)
+            if expected is None:
+                # A new template or file would otherwise go unchecked forever
+                found.append(
+                    f"{section}/{name}: no baseline entry, rerun with "
+                    "CREATE_PY_APP_UPDATE_BASELINE=1"
+                )
+                continue
+            limit = max(expected * TOLERANCE_FACTOR, expected + TOLERANCE_FLOOR_MS)
+            if ms > limit:
+                found.append(f"{section}/{name}: {ms} ms (baseline {expected} ms)")
+    return found
+
+
+def print_report(results: dict) -> None:
+    for section, values in results.items():
+        print(f"\n{section}")
+        for name, ms in values.items():
+            print(f"  {name:<45} {ms:>9.4f}")
+
+
+def test_pairwise_combinations_cover_every_pair():
+    factors = {"a": [0, 1], "b": [0, 1], "c": [0, 1], "d": [0, 1, 2]}
+    rows = pairwise_combinations(factors)
+    assert len(rows) < len(all_combinations(factors))
+    for x, y in itertools.combinations(factors, 2):
+        seen = {(row[x], row[y]) for row in rows}
+        assert seen == set(itertools.product(factors[x], factors[y]))
+
+
+def test_regressions_reports_missing_baseline_entries():
+    current = {"render_ms": {"old_template.txt": 0.1, "new_template.txt": 0.1}}
+    baseline = {"render_ms": {"old_template.txt": 0.1}}
+    assert regressions(current, baseline) == [
+        "render_ms/new_template.txt: no baseline entry, rerun with "
+        "CREATE_PY_APP_UPDATE_BASELINE=1"
+    ]
+
+
+def test_scaffold_benchmark(tmp_path):
+    if TMPFS.is_dir() and os.access(TMPFS, os.W_OK):
+        with tempfile.TemporaryDirectory(dir=TMPFS) as tmpfs_dir:
+            results = run_benchmark(Path(tmpfs_dir))
+    else:
+        results = run_benchmark(tmp_path)
+    print_report(results)
+    if os.environ.get("CREATE_PY_APP_UPDATE_BASELINE"):
+        BASELINE_PATH.write_text(json.dumps(results, indent=2) + "\n")
+        return
+    if not BASELINE_PATH.exists():
+        pytest.skip("No benchmark baseline recorded")
+    baseline = json.loads(BASELINE_PATH.read_text())
+    assert regressions(results, baseline) == []
@@ -0,0 +1,55 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+# Cumulative import time budget for the CLI module, in microseconds. It sits
+# well above what a cold import takes today so only real regressions trip it.
+IMPORT_TIME_BUDGET_US = 100_000
+HEAVY_MODULES = ("jinja2", "curses", "_curses", "subprocess", "dataclasses")
+
+SOURCE_PATH = os.path.join(os.getcwd(), "src")
+
+
+def import_times(*args: str) -> dict[str, int]:
+    """Run a fresh interpreter with -X importtime and return the cumulative
+    import time of every module it loaded."""
+    env = dict(os.environ, PYTHONPATH=SOURCE_PATH)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    times: dict[str, int] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line.removeprefix("import time:").split("|")
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+@pytest.mark.parametrize(
+    "args",
+    [
+        ("-c", "import create_py_app.command"),
+        ("-m", "create_py_app.command", "--help"),
+    ],
+)
+def test_cli_does_not_import_heavy_modules(args):
+    times = import_times(*args)
+    assert "create_py_app" in times
+    loaded = [m for m in HEAVY_MODULES if m in times]
+    assert loaded == []
+
+
+def test_cli_import_time_within_budget():
+    # Take the best of a few runs to smooth out a cold disk cache
+    best = min(
+        import_times("-c", "import create_py_app.command")["create_py_app.command"]
+        for _ in range(3)
+    )
+    assert best < IMPORT_TIME_BUDGET_US
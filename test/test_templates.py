@@ -0,0 +1,46 @@
+from create_py_app import templates
+
+
+def test_get_template_reuses_compiled_template():
+    first = templates.get_template("readme_template.txt")
+    second = templates.get_template("readme_template.txt")
+    assert first is second
+
+
+def test_bytecode_cache_is_written_to_cache_dir(tmp_path):
+    env = templates.make_environment(tmp_path)
+    env.get_template("readme_template.txt")
+    cache_files = list(tmp_path.iterdir())
+    assert len(cache_files) == 1
+    assert templates.package_version() in cache_files[0].name
+
+
+def test_render_reuses_output_for_same_context(monkeypatch):
+    monkeypatch.setattr(templates, "render_cache", templates.RenderCache())
+    first = templates.render("env_template.txt", {"sqla": True})
+    second = templates.render("env_template.txt", {"sqla": True})
+    templates.render("env_template.txt", {"sqla": False})
+    assert first == second
+    stats = templates.render_cache_stats()
+    assert (stats.hits, stats.misses, stats.currsize) == (1, 2, 2)
+
+
+def test_render_cache_evicts_least_recently_used():
+    cache = templates.RenderCache(maxsize=2)
+    cache.put("a", "A")
+    cache.put("b", "B")
+    cache.get("a")
+    cache.put("c", "C")
+    assert list(cache.entries) == ["a", "c"]
+
+
+def test_render_cache_persists_on_disk(tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        templates, "render_cache", templates.RenderCache(directory=tmp_path)
+    )
+    text = templates.render("readme_template.txt", {"project_name": "foo"})
+    monkeypatch.setattr(
+        templates, "render_cache", templates.RenderCache(directory=tmp_path)
+    )
+    assert templates.render("readme_template.txt", {"project_name": "foo"}) == text
+    assert templates.render_cache_stats().disk_hits == 1
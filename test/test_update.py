@@ -0,0 +1,95 @@
+import json
+
+from create_py_app.scaffold import (
+    MANIFEST_NAME,
+    KindOfThing,
+    Scaffolder,
+    ScaffoldOptions,
+)
+from create_py_app.update import merge3, update_project
+
+
+def make_project(folder):
+    options = ScaffoldOptions(
+        kind=KindOfThing.PROGRAM,
+        write_main_script=True,
+        fast_api=False,
+        parse_args=False,
+        scheduled_job=False,
+        use_logging=False,
+        env_settings=False,
+        vs_code=False,
+        sqla=False,
+        repo_pattern=False,
+        di_setup=False,
+        set_up_git=False,
+        tkinter=False,
+        record_manifest=True,
+    )
+    Scaffolder("foo", folder, options).write()
+
+
+def change_options(folder, **changes):
+    manifest_path = folder / MANIFEST_NAME
+    manifest = json.loads(manifest_path.read_text())
+    manifest["options"].update(changes)
+    manifest_path.write_text(json.dumps(manifest))
+
+
+def test_merge3_combines_changes_to_different_lines():
+    base = "a\nb\nc\nd\n"
+    current = "a changed\nb\nc\nd\n"
+    generated = "a\nb\nc\nd changed\n"
+    assert merge3(base, current, generated) == ("a changed\nb\nc\nd changed\n", False)
+
+
+def test_merge3_marks_conflicting_changes():
+    merged, conflict = merge3("a\nb\n", "a\nmine\n", "a\ntheirs\n")
+    assert conflict
+    assert "mine\n=======\ntheirs\n" in merged
+
+
+def test_manifest_records_generated_files(tmp_path):
+    make_project(tmp_path)
+    manifest = json.loads((tmp_path / MANIFEST_NAME).read_text())
+    assert manifest["options"]["write_main_script"]
+    assert manifest["files"]["foo.py"]["content"] == (tmp_path / "foo.py").read_text()
+
+
+def test_update_without_changes_touches_nothing(tmp_path):
+    make_project(tmp_path)
+    mtimes = {p: p.stat().st_mtime_ns for p in tmp_path.rglob("*") if p.is_file()}
+    report = update_project(tmp_path)
+    assert report.created == report.updated == report.merged == []
+    assert "foo.py" in report.unchanged
+    assert mtimes == {
+        p: p.stat().st_mtime_ns for p in tmp_path.rglob("*") if p.is_file()
+    }
+
+
+def test_update_writes_new_output_and_keeps_user_edits(tmp_path):
+    make_project(tmp_path)
+    coveragerc = tmp_path / ".coveragerc"
+    coveragerc.write_text("# my note\n" + coveragerc.read_text())
+    (tmp_path / "readme.md").write_text("# My own readme\n")
+    change_options(tmp_path, env_settings=True)
+
+    report = update_project(tmp_path)
+
+    assert "src/project_settings.py" in report.created
+    assert "requirements.in" in report.updated
+    assert report.merged == [".coveragerc"]
+    assert report.kept == ["readme.md"]
+    assert "pydantic-settings" in (tmp_path / "requirements.in").read_text()
+    merged = coveragerc.read_text()
+    assert merged.startswith("# my note\n")
+    assert "omit = src/project_settings.py" in merged
+    assert (tmp_path / "readme.md").read_text() == "# My own readme\n"
+
+
+def test_update_dry_run_writes_nothing(tmp_path):
+    make_project(tmp_path)
+    change_options(tmp_path, env_settings=True)
+    report = update_project(tmp_path, dry_run=True)
+    assert "src/project_settings.py" in report.created
+    assert not (tmp_path / "src" / "project_settings.py").exists()